@@ -36,17 +36,12 @@ class VersionSync:
 
         content = self.pyproject_path.read_text()
 
-        # Try Poetry format first: version = "x.y.z"
-        match = re.search(r'^version = "([^"]+)"', content, re.MULTILINE)
-        if match:
-            return match.group(1)
-
-        # Try PEP 621 format: version = "x.y.z"
-        match = re.search(
-            r'^\[project\].*?^version = "([^"]+)"', content, re.MULTILINE | re.DOTALL
-        )
-        if match:
-            return match.group(1)
+        # First top-level `version = "x.y.z"` line (Poetry or PEP 621 layout)
+        for line in content.splitlines():
+            if line.startswith('version = "'):
+                version = line.partition('"')[2].rpartition('"')[0]
+                if version:
+                    return version
 
         raise ValueError("Version not found in pyproject.toml")
 
@@ -147,19 +142,24 @@ class VersionSync:
 
         content = init_path.read_text()
 
-        # Pattern to match __version__ = "x.y.z"
-        version_pattern = r'^__version__ = ["\'][^"\']*["\']'
-
-        if not re.search(version_pattern, content, re.MULTILINE):
+        # Rewrite `__version__ = "x.y.z"` lines, keeping anything after the value
+        found = False
+        lines = content.split("\n")
+        for i, line in enumerate(lines):
+            if not line.startswith(("__version__ = '", '__version__ = "')):
+                continue
+            rest = line[len("__version__ = ") + 1 :]
+            end = min((rest.find(q) for q in "'\"" if q in rest), default=-1)
+            if end < 0:
+                continue
+            lines[i] = f'__version__ = "{self.version}"' + rest[end + 1 :]
+            found = True
+
+        if not found:
             # No version found, skip
             return False
 
-        new_content = re.sub(
-            version_pattern,
-            f'__version__ = "{self.version}"',
-            content,
-            flags=re.MULTILINE,
-        )
+        new_content = "\n".join(lines)
 
         if content != new_content:
             if not check_only:
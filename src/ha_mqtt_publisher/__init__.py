@@ -1,26 +1,62 @@
 """An MQTT publisher package with Home Assistant Discovery support"""
 
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
 __version__ = "0.4.1"
 __author__ = "ronschaeffer"
 
-# Import main components for easy access (sorted)
-from .availability import AvailabilityPublisher, install_signal_handlers
-from .commands import CommandProcessor, Executor
-from .config import Config, MQTTConfig
-from .ha_discovery import (
-    Device,
-    DiscoveryManager,
-    Entity,
-    StatusSensor,
-    publish_discovery_configs,
-)
-from .health import HealthState, HealthTracker, HeartbeatFile, make_fastapi_router
-from .json_publish import publish_json, publish_many
-from .publisher import MQTTPublisher
-from .service_runner import run_service_loop, run_service_once
-from .status import StatusError, StatusPayload
-from .topic_map import TopicMap
-from .validator import validate_retained
+if TYPE_CHECKING:
+    from .availability import AvailabilityPublisher, install_signal_handlers
+    from .commands import CommandProcessor, Executor
+    from .config import Config, MQTTConfig, MQTTSettings
+    from .ha_discovery import (
+        Device,
+        DiscoveryManager,
+        Entity,
+        StatusSensor,
+        publish_discovery_configs,
+    )
+    from .health import HealthState, HealthTracker, HeartbeatFile, make_fastapi_router
+    from .json_publish import publish_json, publish_many
+    from .publisher import MQTTPublisher
+    from .service_runner import run_service_loop, run_service_once
+    from .status import StatusError, StatusPayload
+    from .topic_map import TopicMap
+    from .validator import validate_retained
+
+# Public name -> defining submodule. Submodules are imported on first attribute
+# access (PEP 562) so importing the package does not pull in paho-mqtt, PyYAML
+# and every helper up front.
+_LAZY_IMPORTS = {
+    "AvailabilityPublisher": ".availability",
+    "CommandProcessor": ".commands",
+    "Config": ".config",
+    "Device": ".ha_discovery",
+    "DiscoveryManager": ".ha_discovery",
+    "Entity": ".ha_discovery",
+    "Executor": ".commands",
+    "HealthState": ".health",
+    "HealthTracker": ".health",
+    "HeartbeatFile": ".health",
+    "MQTTConfig": ".config",
+    "MQTTPublisher": ".publisher",
+    "MQTTSettings": ".config",
+    "StatusError": ".status",
+    "StatusPayload": ".status",
+    "StatusSensor": ".ha_discovery",
+    "TopicMap": ".topic_map",
+    "install_signal_handlers": ".availability",
+    "make_fastapi_router": ".health",
+    "publish_discovery_configs": ".ha_discovery",
+    "publish_json": ".json_publish",
+    "publish_many": ".json_publish",
+    "run_service_loop": ".service_runner",
+    "run_service_once": ".service_runner",
+    "validate_retained": ".validator",
+}
 
 __all__ = [
     "AvailabilityPublisher",
@@ -35,6 +71,7 @@ __all__ = [
     "HeartbeatFile",
     "MQTTConfig",
     "MQTTPublisher",
+    "MQTTSettings",
     "StatusError",
     "StatusPayload",
     "StatusSensor",
@@ -48,3 +85,23 @@ __all__ = [
     "run_service_once",
     "validate_retained",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        # Submodules that were never imported are not package attributes yet;
+        # import them on demand as eager re-exports used to.
+        try:
+            return importlib.import_module(f".{name}", __name__)
+        except ModuleNotFoundError as exc:
+            if exc.name != f"{__name__}.{name}":
+                raise
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
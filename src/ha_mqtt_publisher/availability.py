@@ -9,9 +9,9 @@ No Home Assistant dependency.
 from __future__ import annotations
 
 from collections.abc import Callable
-from contextlib import AbstractContextManager
 import logging
 import signal
+import sys
 from types import FrameType
 
 logger = logging.getLogger(__name__)
@@ -24,9 +24,14 @@ class AvailabilityPublisher:
     (e.g., paho-mqtt client or library MQTTPublisher).
     """
 
+    # Pre-encoded so the client does not re-encode the payload on every publish
+    _ONLINE = b"online"
+    _OFFLINE = b"offline"
+
     def __init__(self, mqtt_client, topic: str, qos: int = 0):
         self._client = mqtt_client
-        self.topic = topic
+        # Published on every state change; intern so repeat lookups hit identity
+        self.topic = sys.intern(topic)
         self.qos = qos
 
     def online(self, retain: bool = True) -> None:
@@ -35,19 +40,21 @@ class AvailabilityPublisher:
         Method name matches existing project to allow drop-in replacement.
         """
         try:
-            self._client.publish(self.topic, "online", qos=self.qos, retain=retain)
+            self._client.publish(self.topic, self._ONLINE, qos=self.qos, retain=retain)
         except Exception as e:  # pragma: no cover - defensive
             logger.warning("availability online failed: %s", e)
 
     def offline(self, retain: bool = True) -> None:
         """Publish offline state."""
         try:
-            self._client.publish(self.topic, "offline", qos=self.qos, retain=retain)
+            self._client.publish(self.topic, self._OFFLINE, qos=self.qos, retain=retain)
         except Exception as e:  # pragma: no cover - defensive
             logger.warning("availability offline failed: %s", e)
 
 
-class _SignalController(AbstractContextManager):
+class _SignalController:
+    __slots__ = ("_orig_int", "_orig_term", "_shutdown_cb")
+
     def __init__(self, shutdown_cb: Callable[[], None]):
         self._shutdown_cb = shutdown_cb
         self._orig_int = None
@@ -10,19 +10,95 @@ from __future__ import annotations
 from collections import deque
 from collections.abc import Callable
 from dataclasses import dataclass, field
-import json
+from datetime import datetime, timezone
 import logging
+import queue
+from secrets import token_hex
+import sys
 import threading
 import time
 from typing import Any
-import uuid
+
+from . import json_utils
 
 logger = logging.getLogger(__name__)
 
+_UTC = timezone.utc
+_now = datetime.now
+
+# Whitespace bytes skipped before sniffing a raw payload's first byte
+_ASCII_WS = frozenset(b" \t\r\n\x0b\x0c")
+
 Executor = Callable[[dict[str, Any]], tuple[str, str, dict[str, Any]]]
 
 
-@dataclass
+class _DaemonWorkerPool:
+    """Minimal reusable worker pool whose threads are daemons.
+
+    ThreadPoolExecutor workers are joined at interpreter exit, so a hung
+    executor would block shutdown; the per-command threads this replaces
+    were daemons and did not. Workers are started on demand up to
+    max_workers and an idle one is reused before a new one is started.
+    """
+
+    __slots__ = (
+        "_idle",
+        "_lock",
+        "_max_workers",
+        "_name_prefix",
+        "_queue",
+        "_shutdown",
+        "_threads",
+    )
+
+    def __init__(self, max_workers: int, name_prefix: str) -> None:
+        self._max_workers = max(1, max_workers)
+        self._name_prefix = name_prefix
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._idle = threading.Semaphore(0)
+        self._lock = threading.Lock()
+        self._threads: list[threading.Thread] = []
+        self._shutdown = False
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> None:
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("cannot submit after shutdown")
+            self._queue.put((fn, args))
+            if self._idle.acquire(blocking=False):
+                return
+            if len(self._threads) < self._max_workers:
+                thread = threading.Thread(
+                    target=self._work,
+                    name=f"{self._name_prefix}_{len(self._threads)}",
+                    daemon=True,
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def _work(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            fn, args = item
+            try:
+                fn(*args)
+            except Exception:  # pragma: no cover - tasks handle their own errors
+                logger.exception("command worker task failed")
+            self._idle.release()
+
+    def shutdown(self) -> None:
+        """Refuse new work; workers exit once already queued tasks finish."""
+        with self._lock:
+            if self._shutdown:
+                return
+            self._shutdown = True
+            for _ in self._threads:
+                self._queue.put(None)
+
+
+@dataclass(slots=True)
 class CommandProcessor:
     client: Any  # object with publish()
     ack_topic: str
@@ -32,13 +108,27 @@ class CommandProcessor:
     retain_result: bool = False
     qos: int = 1
     executors: dict[str, Executor] = field(default_factory=dict)
+    max_workers: int = 4
     _registry_meta: dict[str, dict[str, Any]] = field(default_factory=dict)
     _last_success_ts: dict[str, float] = field(default_factory=dict)
     _auto_registry_topic: str | None = None
+    # Bumped whenever registry content changes; used to skip redundant publishes
+    _registry_rev: int = 0
+    _published_registry: dict[str, tuple[int, bool, str]] = field(
+        default_factory=dict, repr=False
+    )
     _recent_ids: deque[str] = field(default_factory=deque, repr=False)
     _recent_set: set[str] = field(default_factory=set, repr=False)
     _seq: int = 0
-    _active_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    _seq_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    _cmd_locks: dict[str, threading.Lock] = field(default_factory=dict, repr=False)
+    _executor_pool: _DaemonWorkerPool | None = field(default=None, repr=False)
+
+    def __post_init__(self) -> None:
+        # Bounded dedup window: the deque evicts on append, the set mirrors it
+        self._recent_ids = deque(self._recent_ids, maxlen=max(0, self.max_history))
+        if self._executor_pool is None:
+            self._executor_pool = _DaemonWorkerPool(self.max_workers, "cmd")
 
     # Registration -------------------------------------------------------------
     def register(
@@ -53,7 +143,11 @@ class CommandProcessor:
         cooldown_seconds: int | None = None,
         requires_ai: bool | None = None,
     ) -> None:
+        # Store under the same canonical (stripped, lowercased, interned) form
+        # that _process derives from incoming commands
+        name = sys.intern(name.strip().lower())
         self.executors[name] = executor
+        self._cmd_locks.setdefault(name, threading.Lock())
         meta = {
             "name": name,
             "description": description or "",
@@ -68,10 +162,12 @@ class CommandProcessor:
             meta["cooldown_seconds"] = cooldown_seconds
         if requires_ai is not None:
             meta["requires_ai"] = requires_ai
-        self._registry_meta[name] = meta
+        if self._registry_meta.get(name) != meta:
+            self._registry_meta[name] = meta
+            self._bump_registry_rev()
         if self._auto_registry_topic:
             try:  # pragma: no cover - network safety
-                self.publish_registry(self._auto_registry_topic)
+                self.publish_registry(self._auto_registry_topic, only_if_changed=True)
             except Exception:  # pragma: no cover
                 logger.debug("auto registry publish failed", exc_info=True)
 
@@ -79,9 +175,25 @@ class CommandProcessor:
         self._auto_registry_topic = topic
 
     # Public API ---------------------------------------------------------------
-    def handle_raw(self, payload: bytes | str) -> None:
-        if isinstance(payload, bytes):
-            text = payload.decode("utf-8", errors="ignore")
+    def handle_raw(self, payload: bytes | bytearray | str) -> None:
+        if isinstance(payload, bytes | bytearray):
+            # Find the first non-whitespace byte without copying the payload;
+            # MQTT payloads rarely have leading whitespace so this is O(1).
+            i = 0
+            n = len(payload)
+            while i < n and payload[i] in _ASCII_WS:
+                i += 1
+            # Fast path: JSON commands are parsed straight from the raw bytes,
+            # skipping the intermediate decoded and stripped str copies.
+            if payload[i : i + 1] == b"{":
+                try:
+                    data = json_utils.loads(payload)
+                except Exception:
+                    data = None
+                if isinstance(data, dict):
+                    self._process(data)
+                    return
+            text = payload[i:].decode("utf-8", errors="ignore")
         else:
             text = str(payload)
         stripped = text.strip()
@@ -90,7 +202,7 @@ class CommandProcessor:
             return
         if stripped.startswith("{"):
             try:
-                data = json.loads(stripped) or {}
+                data = json_utils.loads(stripped) or {}
             except Exception:
                 data = {"command": stripped}
         else:
@@ -99,29 +211,39 @@ class CommandProcessor:
 
     # Internal ----------------------------------------------------------------
     def _next_seq(self) -> int:
-        self._seq += 1
-        return self._seq
+        # Executors for different commands may finish concurrently
+        with self._seq_lock:
+            self._seq += 1
+            return self._seq
+
+    def _bump_registry_rev(self) -> None:
+        # Executor workers record successes concurrently with register()
+        with self._seq_lock:
+            self._registry_rev += 1
 
     def _publish(self, topic: str, payload: dict[str, Any], retain: bool) -> None:
         try:
-            self.client.publish(topic, json.dumps(payload), qos=self.qos, retain=retain)
+            self.client.publish(
+                topic, json_utils.dumps(payload), qos=self.qos, retain=retain
+            )
         except Exception as e:  # pragma: no cover
             logger.error("command publish failed topic=%s error=%s", topic, e)
 
     def _process(self, data: dict[str, Any]) -> None:
-        cmd = (data.get("command") or "").strip().lower()
+        cmd = sys.intern((data.get("command") or "").strip().lower())
         if not cmd:
             logger.warning("command with no name ignored")
             return
-        cmd_id = (data.get("id") or "").strip() or str(uuid.uuid4())
+        cmd_id = (data.get("id") or "").strip() or token_hex(8)
         if cmd_id in self._recent_set:
             logger.info("duplicate command ignored id=%s command=%s", cmd_id, cmd)
             return
-        self._recent_ids.append(cmd_id)
-        self._recent_set.add(cmd_id)
-        if len(self._recent_ids) > self.max_history:
-            old = self._recent_ids.popleft()
-            self._recent_set.discard(old)
+        recent = self._recent_ids
+        if recent and len(recent) == recent.maxlen:
+            self._recent_set.discard(recent[0])
+        if recent.maxlen:
+            recent.append(cmd_id)
+            self._recent_set.add(cmd_id)
         seq = self._next_seq()
         received_ts = self._iso_now()
         ack = {
@@ -165,33 +287,53 @@ class CommandProcessor:
                 }
                 self._publish(self.result_topic, result, retain=self.retain_result)
                 return
-        threading.Thread(
-            target=self._run_executor,
-            args=(cmd_id, cmd, executor, data, received_ts),
-            daemon=True,
-        ).start()
-
-    def _run_executor(
-        self,
-        cmd_id: str,
-        cmd: str,
-        executor: Executor,
-        data: dict[str, Any],
-        received_ts: str,
-    ) -> None:
-        start = time.time()
-        if not self._active_lock.acquire(blocking=False):
+        # Single-flight per command: claim the command's lock here so a repeat
+        # of a running command is answered "busy" immediately instead of
+        # queueing, while different commands may run concurrently.
+        lock = self._cmd_locks.get(cmd)
+        if lock is None:
+            lock = self._cmd_locks.setdefault(cmd, threading.Lock())
+        if not lock.acquire(blocking=False):
             result = {
                 "id": cmd_id,
                 "command": cmd,
                 "completed_ts": self._iso_now(),
                 "outcome": "busy",
-                "details": "Another command is executing",
+                "details": "Command is already executing",
                 "duration_ms": 0,
                 "seq": self._next_seq(),
             }
             self._publish(self.result_topic, result, retain=self.retain_result)
             return
+        try:
+            self._executor_pool.submit(
+                self._run_executor, cmd_id, cmd, executor, data, received_ts
+            )
+        except RuntimeError:
+            # close() was called; the ack is already out, so answer it
+            lock.release()
+            logger.error("command executor pool closed id=%s command=%s", cmd_id, cmd)
+            result = {
+                "id": cmd_id,
+                "command": cmd,
+                "completed_ts": self._iso_now(),
+                "outcome": "closed",
+                "details": "Command processor is closed",
+                "duration_ms": 0,
+                "seq": self._next_seq(),
+            }
+            self._publish(self.result_topic, result, retain=self.retain_result)
+
+    def _run_executor(
+        self,
+        cmd_id: str,
+        cmd: str,
+        executor: Executor,
+        data: dict[str, Any],
+        received_ts: str,
+    ) -> None:
+        # Runs on a pool worker; _process already holds this command's lock
+        start = time.time()
         try:
             ctx = {
                 "id": cmd_id,
@@ -208,8 +350,7 @@ class CommandProcessor:
             details = str(e)
             extra = {}
         finally:
-            if self._active_lock.locked():
-                self._active_lock.release()
+            self._cmd_locks[cmd].release()
         duration_ms = int((time.time() - start) * 1000)
         result = {
             "id": cmd_id,
@@ -225,12 +366,20 @@ class CommandProcessor:
         self._publish(self.result_topic, result, retain=self.retain_result)
         if outcome == "success":
             self._last_success_ts[cmd] = start
+            self._bump_registry_rev()
+
+    def close(self) -> None:
+        """Stop accepting commands and release the executor worker threads.
+
+        Commands received afterwards are answered with a "closed" result.
+        This does not wait for commands that are already running; workers
+        are daemon threads, so a hung executor does not block process exit.
+        """
+        self._executor_pool.shutdown()
 
     @staticmethod
     def _iso_now() -> str:
-        from datetime import datetime, timezone
-
-        return datetime.now(timezone.utc).isoformat()
+        return _now(_UTC).isoformat()
 
     # Registry ----------------------------------------------------------------
     def build_registry_payload(
@@ -250,10 +399,25 @@ class CommandProcessor:
         }
 
     def publish_registry(
-        self, topic: str, *, retain: bool = True, service_name: str = "service"
+        self,
+        topic: str,
+        *,
+        retain: bool = True,
+        service_name: str = "service",
+        only_if_changed: bool = False,
     ) -> None:
+        """Publish the command registry to topic.
+
+        With only_if_changed, the payload is neither built nor encoded when the
+        registry has not changed since it was last published to this topic
+        with the same retain flag and service name.
+        """
+        stamp = (self._registry_rev, retain, service_name)
+        if only_if_changed and self._published_registry.get(topic) == stamp:
+            return
         payload = self.build_registry_payload(service_name=service_name)
         self._publish(topic, payload, retain=retain)
+        self._published_registry[topic] = stamp
 
 
 __all__ = ["CommandProcessor", "Executor"]
@@ -1,4 +1,275 @@
+from collections import OrderedDict, deque
+import copy
+from dataclasses import dataclass
+import functools
+import json
+import os
+import threading
+
 import yaml
+from yaml.composer import Composer, ComposerError
+from yaml.constructor import SafeConstructor
+from yaml.resolver import Resolver
+
+# libyaml-backed safe loader when PyYAML was built with it, else pure Python
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Parsed YAML keyed by absolute path -> ((st_mtime_ns, st_size), parsed data)
+_CONFIG_CACHE: OrderedDict = OrderedDict()
+_CONFIG_CACHE_MAX = 100
+_CONFIG_CACHE_LOCK = threading.Lock()
+
+# Opt-in: keep a "<config>.cache.json" shadow of the parsed YAML next to the file
+_JSON_SHADOW_ENV = "HA_MQTT_YAML_JSON_CACHE"
+_JSON_SHADOW_SUFFIX = ".cache.json"
+
+
+def _read_config_file(path: str, st: os.stat_result):
+    """Parse a YAML config file, optionally via its JSON shadow."""
+    if os.environ.get(_JSON_SHADOW_ENV) != "1":
+        with open(path) as config_file:
+            return yaml.load(config_file, Loader=_YAML_LOADER)
+
+    shadow_path = path + _JSON_SHADOW_SUFFIX
+    try:
+        if os.stat(shadow_path).st_mtime_ns >= st.st_mtime_ns:
+            with open(shadow_path) as shadow_file:
+                return json.load(shadow_file)
+    except (OSError, ValueError):
+        pass
+
+    with open(path) as config_file:
+        data = yaml.load(config_file, Loader=_YAML_LOADER)
+    _write_json_shadow(shadow_path, data)
+    return data
+
+
+def _write_json_shadow(shadow_path: str, data) -> None:
+    """Best-effort write of a JSON shadow; skipped when JSON would be lossy."""
+    try:
+        text = json.dumps(data)
+        # YAML dates, sets, non-string keys etc. don't survive JSON unchanged
+        if json.loads(text) != data:
+            return
+        tmp_path = f"{shadow_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as shadow_file:
+            shadow_file.write(text)
+        os.replace(tmp_path, shadow_path)
+    except (OSError, TypeError, ValueError):
+        pass
+
+
+_IMMUTABLE_SCALARS = (str, int, float, bool, type(None))
+
+
+def _clone_tree(data):
+    """Copy parsed YAML for a Config instance; much cheaper than deepcopy.
+
+    Plain dicts and lists are rebuilt and immutable scalars shared; anything
+    else (dates, sets, ...) goes through deepcopy. Nodes shared via YAML
+    aliases come out as independent copies.
+    """
+    try:
+        return _clone_node(data)
+    except RecursionError:
+        # Self-referencing anchors; deepcopy's memo handles the cycle
+        return copy.deepcopy(data)
+
+
+def _clone_node(node):
+    node_type = type(node)
+    if node_type is dict:
+        return {key: _clone_node(value) for key, value in node.items()}
+    if node_type is list:
+        return [_clone_node(value) for value in node]
+    if isinstance(node, _IMMUTABLE_SCALARS):
+        return node
+    return copy.deepcopy(node)
+
+
+class _EventReplayLoader(Composer, SafeConstructor, Resolver):
+    """Compose and construct a document from a pre-recorded event list."""
+
+    def __init__(self, events):
+        self._events = deque(events)
+        Composer.__init__(self)
+        SafeConstructor.__init__(self)
+        Resolver.__init__(self)
+
+    def check_event(self, *choices):
+        if not self._events:
+            return False
+        if not choices:
+            return True
+        return isinstance(self._events[0], choices)
+
+    def peek_event(self):
+        return self._events[0]
+
+    def get_event(self):
+        return self._events.popleft()
+
+    def dispose(self):
+        pass
+
+
+def _collect_node_events(events, first) -> list:
+    """Consume the remaining events of the node starting at ``first``."""
+    collected = [first]
+    if isinstance(first, yaml.CollectionStartEvent):
+        depth = 1
+        for event in events:
+            collected.append(event)
+            if isinstance(event, yaml.CollectionStartEvent):
+                depth += 1
+            elif isinstance(event, yaml.CollectionEndEvent):
+                depth -= 1
+                if depth == 0:
+                    break
+    return collected
+
+
+def _check_qos(value: int) -> None:
+    if not (0 <= value <= 2):
+        raise ValueError(f"default_qos must be 0, 1, or 2, got: {value}")
+
+
+def _coerce_bool(value):
+    if isinstance(value, str):
+        return value.lower() in ("true", "1", "yes", "on")
+    return value
+
+
+# build_config scalar fields: (key, default when None, caster, validator)
+_FIELDS = (
+    ("broker_url", None, None, None),
+    ("broker_port", 1883, int, None),
+    ("client_id", "mqtt_client", None, None),
+    ("security", "none", None, None),
+    ("max_retries", 3, int, None),
+    ("default_qos", 0, int, _check_qos),
+    ("default_retain", False, _coerce_bool, None),
+)
+# Optional sections copied through only when truthy
+_SECTION_FIELDS = ("tls", "last_will", "logging_config")
+# Keys read from a config mapping (credentials come from the auth section)
+_INPUT_KEYS = tuple(field[0] for field in _FIELDS) + _SECTION_FIELDS
+# Keys passed on to MQTTPublisher
+_PUBLISHER_KEYS = (
+    "broker_url",
+    "broker_port",
+    "client_id",
+    "security",
+    "auth",
+    "tls",
+    "max_retries",
+    "last_will",
+    "default_qos",
+    "default_retain",
+    "logging_config",
+)
+
+
+@functools.lru_cache(maxsize=32)
+def _dotted_keys(section: str) -> dict[str, str]:
+    """Map each key from_mapping reads to its '<section>.<key>' form."""
+    keys = (*_INPUT_KEYS, "auth", "username", "password")
+    return {key: f"{section}.{key}" for key in keys}
+
+
+_ERR_BROKER_URL = "broker_url is required"
+_ERR_CLIENT_ID = "client_id is required"
+_ERR_CLIENT_CERT = "client_cert and client_key required for tls_with_client_cert"
+_WARN_TLS_PLAIN_PORT = (
+    "Warning: TLS enabled but using non-TLS port 1883. Consider port 8883 for TLS"
+)
+_WARN_PLAIN_TLS_PORT = (
+    "Warning: TLS disabled but using TLS port 8883. Consider port 1883 for non-TLS"
+)
+_AUTH_SECURITY = frozenset(("username", "tls", "tls_with_client_cert"))
+_TLS_SECURITY = frozenset(("tls", "tls_with_client_cert"))
+
+
+def _v_broker_url(config: dict, errors: list) -> None:
+    if not config.get("broker_url"):
+        errors.append(_ERR_BROKER_URL)
+
+
+def _v_port(config: dict, errors: list) -> None:
+    broker_port = config.get("broker_port")
+    if not isinstance(broker_port, int) or not (1 <= broker_port <= 65535):
+        errors.append(f"broker_port must be integer 1-65535, got: {broker_port}")
+
+
+def _v_client_id(config: dict, errors: list) -> None:
+    if not config.get("client_id"):
+        errors.append(_ERR_CLIENT_ID)
+
+
+def _v_security(config: dict, errors: list) -> None:
+    security = config.get("security", "none")
+    if security not in _AUTH_SECURITY:
+        return
+    auth = config.get("auth") or {}
+    if not (auth.get("username") and auth.get("password")):
+        errors.append(f"username and password required when security='{security}'")
+    if security in _TLS_SECURITY:
+        tls = config.get("tls")
+        if not tls:
+            errors.append(f"TLS configuration required when security='{security}'")
+        elif security == "tls_with_client_cert" and not (
+            tls.get("client_cert") and tls.get("client_key")
+        ):
+            errors.append(_ERR_CLIENT_CERT)
+
+
+def _v_tls_port(config: dict, errors: list) -> None:
+    # Configuration consistency warnings
+    broker_port = config.get("broker_port")
+    if config.get("tls"):
+        if broker_port == 1883:
+            errors.append(_WARN_TLS_PLAIN_PORT)
+    elif broker_port == 8883:
+        errors.append(_WARN_PLAIN_TLS_PORT)
+
+
+# validate_config runs these in order; each appends its messages to errors
+_VALIDATORS = (_v_broker_url, _v_port, _v_client_id, _v_security, _v_tls_port)
+
+
+@dataclass(slots=True, frozen=True)
+class MQTTSettings:
+    """Immutable, typed form of a built MQTT configuration.
+
+    Fields mirror the keys of ``MQTTConfig.build_config()``, so an existing
+    config dict converts with ``MQTTSettings(**config)`` and back with
+    ``as_dict()``.
+    """
+
+    broker_url: str
+    broker_port: int = 1883
+    client_id: str = "mqtt_client"
+    security: str = "none"
+    max_retries: int = 3
+    default_qos: int = 0
+    default_retain: bool = False
+    auth: dict | None = None
+    tls: dict | None = None
+    last_will: dict | None = None
+    logging_config: dict | None = None
+
+    def as_dict(self) -> dict:
+        """Return the dict shape produced by ``MQTTConfig.build_config()``."""
+        config = {field[0]: getattr(self, field[0]) for field in _FIELDS}
+        for key in ("auth", *_SECTION_FIELDS):
+            value = getattr(self, key)
+            if value:
+                config[key] = value
+        return config
+
+    def validate(self) -> None:
+        """Validate these settings; see ``MQTTConfig.validate_config()``."""
+        MQTTConfig.validate_config(self.as_dict())
 
 
 class MQTTConfig:
@@ -16,8 +287,8 @@ class MQTTConfig:
         Args:
             broker_url: MQTT broker URL (required)
             broker_port: MQTT broker port (default: 1883)
-            client_id: MQTT client ID (default: "mqtt_client")
-            security: Security mode (default: "none")
+            client_id: MQTT client ID (default: "mqtt_client" when None)
+            security: Security mode (default: "none" when None)
             username: Username for authentication
             password: Password for authentication
             tls: TLS configuration dictionary
@@ -33,43 +304,19 @@ class MQTTConfig:
         Raises:
             ValueError: If required fields are missing or invalid
         """
-        # Handle port conversion with proper defaults
-        broker_port = kwargs.get("broker_port")
-        if broker_port is None:
-            broker_port = 1883
-        else:
-            broker_port = int(broker_port)
-
-        # Handle max_retries conversion with proper defaults
-        max_retries = kwargs.get("max_retries")
-        if max_retries is None:
-            max_retries = 3
-        else:
-            max_retries = int(max_retries)
-
-        # Handle default_qos conversion with proper defaults
-        default_qos = kwargs.get("default_qos")
-        if default_qos is None:
-            default_qos = 0
-        else:
-            default_qos = int(default_qos)
-            if not (0 <= default_qos <= 2):
-                raise ValueError(f"default_qos must be 0, 1, or 2, got: {default_qos}")
-
-        # Handle default_retain conversion with proper defaults
-        default_retain = kwargs.get("default_retain", False)
-        if isinstance(default_retain, str):
-            default_retain = default_retain.lower() in ("true", "1", "yes", "on")
-
-        config = {
-            "broker_url": kwargs.get("broker_url"),
-            "broker_port": broker_port,
-            "client_id": kwargs.get("client_id") or "mqtt_client",
-            "security": kwargs.get("security") or "none",
-            "max_retries": max_retries,
-            "default_qos": default_qos,
-            "default_retain": default_retain,
-        }
+        # One pass over the scalar fields; only None means "not provided", so
+        # explicit empty strings are kept as-is
+        config = {}
+        for key, default, cast, check in _FIELDS:
+            value = kwargs.get(key)
+            if value is None:
+                value = default
+            else:
+                if cast is not None:
+                    value = cast(value)
+                if check is not None:
+                    check(value)
+            config[key] = value
 
         # Handle authentication
         username = kwargs.get("username")
@@ -80,20 +327,11 @@ class MQTTConfig:
                 "password": password,
             }
 
-        # Handle TLS configuration
-        tls = kwargs.get("tls")
-        if tls:
-            config["tls"] = tls
-
-        # Handle Last Will and Testament
-        last_will = kwargs.get("last_will")
-        if last_will:
-            config["last_will"] = last_will
-
-        # Handle logging configuration
-        logging_config = kwargs.get("logging_config")
-        if logging_config:
-            config["logging_config"] = logging_config
+        # TLS, Last Will and logging sections are only included when set
+        for key in _SECTION_FIELDS:
+            value = kwargs.get(key)
+            if value:
+                config[key] = value
 
         # Validate required fields
         if not config["broker_url"]:
@@ -101,6 +339,11 @@ class MQTTConfig:
 
         return config
 
+    @staticmethod
+    def build_settings(**kwargs) -> MQTTSettings:
+        """Like ``build_config()`` but return an immutable ``MQTTSettings``."""
+        return MQTTSettings(**MQTTConfig.build_config(**kwargs))
+
     @staticmethod
     def from_dict(config_dict: dict) -> dict:
         """Build MQTT config from nested dictionary (like YAML config).
@@ -133,18 +376,9 @@ class MQTTConfig:
         auth_section = mqtt_section.get("auth", {})
 
         return MQTTConfig.build_config(
-            broker_url=mqtt_section.get("broker_url"),
-            broker_port=mqtt_section.get("broker_port"),
-            client_id=mqtt_section.get("client_id"),
-            security=mqtt_section.get("security"),
+            **{key: mqtt_section.get(key) for key in _INPUT_KEYS},
             username=auth_section.get("username"),
             password=auth_section.get("password"),
-            tls=mqtt_section.get("tls"),
-            max_retries=mqtt_section.get("max_retries"),
-            last_will=mqtt_section.get("last_will"),
-            default_qos=mqtt_section.get("default_qos"),
-            default_retain=mqtt_section.get("default_retain"),
-            logging_config=mqtt_section.get("logging_config"),
         )
 
     @staticmethod
@@ -153,47 +387,32 @@ class MQTTConfig:
 
         Supports keys like 'mqtt.broker_url' or nested mapping under 'mqtt'.
         """
-
-        def _get(key: str, default=None):
-            if f"{section}.{key}" in mapping:
-                return mapping.get(f"{section}.{key}")
-            if section in mapping and isinstance(mapping[section], dict):
-                return mapping[section].get(key, default)
-            return mapping.get(key, default)
+        dotted_keys = _dotted_keys(section)
+        nested = mapping.get(section)
+        if not isinstance(nested, dict):
+            nested = None
+
+        def _get(key: str):
+            dotted = dotted_keys[key]
+            if dotted in mapping:
+                return mapping[dotted]
+            if nested is not None:
+                return nested.get(key)
+            return mapping.get(key)
 
         auth = _get("auth") or {}
         return MQTTConfig.build_config(
-            broker_url=_get("broker_url"),
-            broker_port=_get("broker_port"),
-            client_id=_get("client_id"),
-            security=_get("security"),
+            **{key: _get(key) for key in _INPUT_KEYS},
             username=auth.get("username") or _get("username"),
             password=auth.get("password") or _get("password"),
-            tls=_get("tls"),
-            max_retries=_get("max_retries"),
-            last_will=_get("last_will"),
-            default_qos=_get("default_qos"),
-            default_retain=_get("default_retain"),
-            logging_config=_get("logging_config"),
         )
 
     @staticmethod
-    def to_publisher_kwargs(config: dict) -> dict:
+    def to_publisher_kwargs(config: dict | MQTTSettings) -> dict:
         """Convert validated config dict to kwargs for MQTTPublisher."""
-        out = {
-            "broker_url": config.get("broker_url"),
-            "broker_port": config.get("broker_port"),
-            "client_id": config.get("client_id"),
-            "security": config.get("security"),
-            "auth": config.get("auth"),
-            "tls": config.get("tls"),
-            "max_retries": config.get("max_retries"),
-            "last_will": config.get("last_will"),
-            "default_qos": config.get("default_qos"),
-            "default_retain": config.get("default_retain"),
-            "logging_config": config.get("logging_config"),
-        }
-        return out
+        if isinstance(config, MQTTSettings):
+            return {key: getattr(config, key) for key in _PUBLISHER_KEYS}
+        return {key: config.get(key) for key in _PUBLISHER_KEYS}
 
     @staticmethod
     def validate_config(config: dict) -> None:
@@ -205,57 +424,43 @@ class MQTTConfig:
         Raises:
             ValueError: If configuration is invalid with detailed error messages
         """
-        errors = []
-
-        # Check required fields
-        if not config.get("broker_url"):
-            errors.append("broker_url is required")
-
-        # Validate port
-        broker_port = config.get("broker_port")
-        if not isinstance(broker_port, int) or not (1 <= broker_port <= 65535):
-            errors.append(f"broker_port must be integer 1-65535, got: {broker_port}")
-
-        # Validate client_id
-        if not config.get("client_id"):
-            errors.append("client_id is required")
-
-        # Validate security-specific requirements
-        security = config.get("security", "none")
-        if security in ["username", "tls", "tls_with_client_cert"]:
-            auth = config.get("auth", {})
-            if not (auth.get("username") and auth.get("password")):
-                errors.append(
-                    f"username and password required when security='{security}'"
-                )
-
-        if security in ["tls", "tls_with_client_cert"]:
-            if not config.get("tls"):
-                errors.append(f"TLS configuration required when security='{security}'")
-            elif security == "tls_with_client_cert":
-                tls = config.get("tls", {})
-                if not all(tls.get(key) for key in ["client_cert", "client_key"]):
-                    errors.append(
-                        "client_cert and client_key required for tls_with_client_cert"
-                    )
-
-        # Configuration consistency warnings
-        tls = config.get("tls")
-        if tls and broker_port == 1883:
-            errors.append(
-                "Warning: TLS enabled but using non-TLS port 1883. Consider port 8883 for TLS"
-            )
+        errors: list[str] = []
+        for check in _VALIDATORS:
+            check(config, errors)
+        if errors:
+            raise ValueError("MQTT configuration errors:\n- " + "\n- ".join(errors))
 
-        if not tls and broker_port == 8883:
-            errors.append(
-                "Warning: TLS disabled but using TLS port 8883. Consider port 1883 for non-TLS"
-            )
 
-        if errors:
-            raise ValueError(
-                "MQTT configuration errors:\n"
-                + "\n".join(f"- {error}" for error in errors)
-            )
+def _build_attr_index(config) -> dict[str, tuple[str, ...]]:
+    """Map underscore-joined names to key paths for Config attribute lookups.
+
+    Nested paths are joined with ``_`` (``mqtt_broker_url`` ->
+    ``("mqtt", "broker_url")``); the first path to produce a name wins. Only
+    paths are stored, never values, so lookups always read the live mapping.
+    """
+    index: dict[str, tuple[str, ...]] = {}
+    if not isinstance(config, dict):
+        return index
+
+    # ids of the dicts on the current path; stops self-referencing anchors
+    ancestors = {id(config)}
+
+    def walk(prefix, node):
+        ancestors.add(id(node))
+        for key, value in node.items():
+            if not isinstance(key, str):
+                continue
+            path = (*prefix, key)
+            index.setdefault("_".join(path), path)
+            if isinstance(value, dict) and id(value) not in ancestors:
+                walk(path, value)
+        ancestors.discard(id(node))
+
+    for key, value in config.items():
+        if isinstance(key, str) and isinstance(value, dict):
+            if id(value) not in ancestors:
+                walk((key,), value)
+    return index
 
 
 class Config:
@@ -264,20 +469,138 @@ class Config:
 
     Supports both dot notation (config.get("mqtt.broker_url")) and
     underscore notation (config.mqtt_broker_url) for accessing nested values.
+    Lookups always read the live ``config`` mapping. Underscore names are
+    resolved through an index of key paths built when ``config`` is assigned;
+    names it does not know fall back to splitting on ``_``. Call
+    ``refresh_index()`` after adding nested keys whose names contain ``_``.
     """
 
     def __init__(self, config_path):
+        # Parsed files are cached per path and reused while mtime and size are
+        # unchanged; each instance gets its own copy so edits don't leak.
+        path = os.path.abspath(config_path)
+        st = os.stat(path)
+        stamp = (st.st_mtime_ns, st.st_size)
+
+        with _CONFIG_CACHE_LOCK:
+            cached = _CONFIG_CACHE.get(path)
+            if cached is not None and cached[0] == stamp:
+                _CONFIG_CACHE.move_to_end(path)
+                self.config = _clone_tree(cached[1])
+                return
+
+        self.config = _read_config_file(path, st)
+
+        with _CONFIG_CACHE_LOCK:
+            _CONFIG_CACHE[path] = (stamp, _clone_tree(self.config))
+            _CONFIG_CACHE.move_to_end(path)
+            while len(_CONFIG_CACHE) > _CONFIG_CACHE_MAX:
+                _CONFIG_CACHE.popitem(last=False)
+
+    @staticmethod
+    def clear_cache() -> None:
+        """Drop all cached parsed configuration files."""
+        with _CONFIG_CACHE_LOCK:
+            _CONFIG_CACHE.clear()
+
+    @staticmethod
+    def load_section(config_path, section: str, default=None):
+        """
+        Load a single top-level section from a YAML file.
+
+        Streams parser events and stops as soon as the requested section has
+        been read, so unrelated (possibly large) sections after it are never
+        parsed or constructed.
+
+        Args:
+            config_path: Path to the YAML configuration file
+            section: Top-level key to load (e.g. "mqtt")
+            default: Value returned when the section is not present
+
+        Returns:
+            The constructed value of the section, or default
+        """
         with open(config_path) as config_file:
-            self.config = yaml.safe_load(config_file)
+            events = yaml.parse(config_file, Loader=_YAML_LOADER)
+            for event in events:
+                if isinstance(event, yaml.MappingStartEvent):
+                    break
+                if not isinstance(
+                    event, yaml.StreamStartEvent | yaml.DocumentStartEvent
+                ):
+                    return default
+            else:
+                return default
+
+            for key_event in events:
+                if isinstance(key_event, yaml.MappingEndEvent):
+                    return default
+                _collect_node_events(events, key_event)
+                value_events = _collect_node_events(events, next(events))
+                if (
+                    isinstance(key_event, yaml.ScalarEvent)
+                    and key_event.value == section
+                ):
+                    break
+            else:
+                return default
+
+        loader = _EventReplayLoader(
+            [
+                yaml.StreamStartEvent(),
+                yaml.DocumentStartEvent(),
+                *value_events,
+                yaml.DocumentEndEvent(),
+                yaml.StreamEndEvent(),
+            ]
+        )
+        try:
+            return loader.get_single_data()
+        except ComposerError:
+            # The section references an anchor defined elsewhere in the file
+            with open(config_path) as config_file:
+                data = yaml.load(config_file, Loader=_YAML_LOADER) or {}
+            return data.get(section, default)
+
+    @property
+    def config(self):
+        """The parsed configuration mapping."""
+        return self._config
+
+    @config.setter
+    def config(self, value):
+        self._config = value
+        self._attr_index = _build_attr_index(value)
+
+    def refresh_index(self) -> None:
+        """Rebuild the key path index after adding keys to ``config`` in place."""
+        self._attr_index = _build_attr_index(self._config)
 
     def __getattr__(self, name):
+        # Only reached for names that are not real attributes; read state from
+        # __dict__ so a half-built instance (copy, pickle) can't recurse.
+        config = self.__dict__.get("_config")
+        if not isinstance(config, dict):
+            raise AttributeError(f"Configuration key '{name}' not found")
+
         # First try to get directly from top level
-        if name in self.config:
-            return self.config[name]
+        if name in config:
+            return config[name]
+
+        # Fast path: follow the indexed key path through the live mapping
+        path = self.__dict__.get("_attr_index", {}).get(name)
+        if path is not None:
+            value = config
+            for key in path:
+                if not isinstance(value, dict) or key not in value:
+                    break
+                value = value[key]
+            else:
+                return value
 
         # If not found, try nested dictionary lookup
         keys = name.split("_")
-        value = self.config
+        value = config
         for key in keys:
             if not isinstance(value, dict) or key not in value:
                 raise AttributeError(f"Configuration key '{name}' not found")
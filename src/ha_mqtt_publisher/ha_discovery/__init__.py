@@ -5,45 +5,86 @@ Provides Home Assistant MQTT Discovery support: entity classes, device
 management, and discovery publishing helpers.
 """
 
-from .device import Device
-from .discovery_manager import DiscoveryManager
-from .enhanced_publisher import (
-    create_command_entities,
-    create_standard_buttons,
-    publish_device_level_discovery,
-)
-from .entity import (
-    AlarmControlPanel,
-    BinarySensor,
-    Button,
-    Camera,
-    Climate,
-    Cover,
-    DeviceTracker,
-    Entity,
-    Fan,
-    Light,
-    Lock,
-    Number,
-    Select,
-    Sensor,
-    Switch,
-    Text,
-)
-from .publisher import (
-    AvailabilityMode,
-    EntityCategory,
-    SensorStateClass,
-    StatusSensor,
-    create_sensor,
-    create_status_sensor,
-    ensure_discovery,
-    publish_command_buttons,
-    publish_device_bundle,
-    publish_device_config,
-    publish_discovery_configs,
-    purge_legacy_discovery,
-)
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .constants import AvailabilityMode, EntityCategory, SensorStateClass
+    from .device import Device
+    from .discovery_manager import DiscoveryManager
+    from .enhanced_publisher import (
+        create_command_entities,
+        create_standard_buttons,
+        publish_device_level_discovery,
+    )
+    from .entity import (
+        AlarmControlPanel,
+        BinarySensor,
+        Button,
+        Camera,
+        Climate,
+        Cover,
+        DeviceTracker,
+        Entity,
+        Fan,
+        Light,
+        Lock,
+        Number,
+        Select,
+        Sensor,
+        Switch,
+        Text,
+    )
+    from .publisher import (
+        create_sensor,
+        create_status_sensor,
+        ensure_discovery,
+        publish_command_buttons,
+        publish_device_bundle,
+        publish_device_config,
+        publish_discovery_configs,
+        purge_legacy_discovery,
+    )
+    from .status_sensor import StatusSensor
+
+# Public name -> defining submodule, imported on first attribute access (PEP 562)
+_LAZY_IMPORTS = {
+    "AlarmControlPanel": ".entity",
+    "AvailabilityMode": ".constants",
+    "BinarySensor": ".entity",
+    "Button": ".entity",
+    "Camera": ".entity",
+    "Climate": ".entity",
+    "Cover": ".entity",
+    "Device": ".device",
+    "DeviceTracker": ".entity",
+    "DiscoveryManager": ".discovery_manager",
+    "Entity": ".entity",
+    "EntityCategory": ".constants",
+    "Fan": ".entity",
+    "Light": ".entity",
+    "Lock": ".entity",
+    "Number": ".entity",
+    "Select": ".entity",
+    "Sensor": ".entity",
+    "SensorStateClass": ".constants",
+    "StatusSensor": ".status_sensor",
+    "Switch": ".entity",
+    "Text": ".entity",
+    "create_command_entities": ".enhanced_publisher",
+    "create_sensor": ".publisher",
+    "create_standard_buttons": ".enhanced_publisher",
+    "create_status_sensor": ".publisher",
+    "ensure_discovery": ".publisher",
+    "publish_command_buttons": ".publisher",
+    "publish_device_bundle": ".publisher",
+    "publish_device_config": ".publisher",
+    "publish_device_level_discovery": ".enhanced_publisher",
+    "publish_discovery_configs": ".publisher",
+    "purge_legacy_discovery": ".publisher",
+}
 
 __all__ = [
     "AlarmControlPanel",
@@ -80,3 +121,23 @@ __all__ = [
     "publish_discovery_configs",
     "purge_legacy_discovery",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        # Submodules that were never imported are not package attributes yet;
+        # import them on demand as eager re-exports used to.
+        try:
+            return importlib.import_module(f".{name}", __name__)
+        except ModuleNotFoundError as exc:
+            if exc.name != f"{__name__}.{name}":
+                raise
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
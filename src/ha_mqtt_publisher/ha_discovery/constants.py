@@ -6,19 +6,19 @@ and enable light validation while keeping runtime payloads as plain strings.
 
 from __future__ import annotations
 
-from typing import Literal
+from typing import Literal, get_args
 
 # Entity category
 EntityCategory = Literal["config", "diagnostic"]
-ENTITY_CATEGORIES: set[str] = {"config", "diagnostic"}
+ENTITY_CATEGORIES: frozenset[str] = frozenset(get_args(EntityCategory))
 
 # Availability mode
 AvailabilityMode = Literal["all", "any", "latest"]
-AVAILABILITY_MODES: set[str] = {"all", "any", "latest"}
+AVAILABILITY_MODES: frozenset[str] = frozenset(get_args(AvailabilityMode))
 
 # Sensor state_class
 SensorStateClass = Literal["measurement", "total", "total_increasing"]
-SENSOR_STATE_CLASSES: set[str] = {"measurement", "total", "total_increasing"}
+SENSOR_STATE_CLASSES: frozenset[str] = frozenset(get_args(SensorStateClass))
 
 # Binary sensor device_class (subset maintained from HA docs)
 BinarySensorDeviceClass = Literal[
@@ -49,35 +49,9 @@ BinarySensorDeviceClass = Literal[
     "vibration",
     "window",
 ]
-_BS_DEV_CLASSES = [
-    "battery",
-    "battery_charging",
-    "carbon_monoxide",
-    "cold",
-    "connectivity",
-    "door",
-    "garage_door",
-    "gas",
-    "heat",
-    "light",
-    "lock",
-    "moisture",
-    "moving",
-    "occupancy",
-    "opening",
-    "plug",
-    "power",
-    "presence",
-    "problem",
-    "safety",
-    "smoke",
-    "sound",
-    "tamper",
-    "update",
-    "vibration",
-    "window",
-]
-BINARY_SENSOR_DEVICE_CLASSES: set[str] = set(_BS_DEV_CLASSES)
+BINARY_SENSOR_DEVICE_CLASSES: frozenset[str] = frozenset(
+    get_args(BinarySensorDeviceClass)
+)
 
 # Sensor device_class (broad set mirroring HA docs; may not be exhaustive)
 SensorDeviceClass = Literal[
@@ -131,58 +105,7 @@ SensorDeviceClass = Literal[
     "weight",
     "wind_speed",
 ]
-_SENSOR_DEV_CLASSES = [
-    "apparent_power",
-    "aqi",
-    "atmospheric_pressure",
-    "battery",
-    "carbon_dioxide",
-    "carbon_monoxide",
-    "current",
-    "data_rate",
-    "data_size",
-    "distance",
-    "duration",
-    "energy",
-    "energy_storage",
-    "enum",
-    "frequency",
-    "gas",
-    "humidity",
-    "illuminance",
-    "irradiance",
-    "moisture",
-    "monetary",
-    "nitrogen_dioxide",
-    "nitrogen_monoxide",
-    "nitrous_oxide",
-    "ozone",
-    "pm1",
-    "pm10",
-    "pm25",
-    "power",
-    "power_factor",
-    "precipitation",
-    "precipitation_intensity",
-    "pressure",
-    "reactive_power",
-    "signal_strength",
-    "sound_pressure",
-    "speed",
-    "sulphur_dioxide",
-    "temperature",
-    "timestamp",
-    "volatile_organic_compounds",
-    "volatile_organic_compounds_parts",
-    "voltage",
-    "volume",
-    "volume_flow_rate",
-    "volume_storage",
-    "water",
-    "weight",
-    "wind_speed",
-]
-SENSOR_DEVICE_CLASSES: set[str] = set(_SENSOR_DEV_CLASSES)
+SENSOR_DEVICE_CLASSES: frozenset[str] = frozenset(get_args(SensorDeviceClass))
 
 __all__ = [
     "AVAILABILITY_MODES",
@@ -7,6 +7,21 @@ This module provides the Device class which represents a physical or logical
 device in Home Assistant that groups multiple entities together.
 """
 
+# (attribute, config key, default) for every field after identifiers
+_CONFIG_FIELDS = (
+    ("name", "app.name", "MQTT Publisher"),
+    ("manufacturer", "app.manufacturer", "Generic MQTT Publisher"),
+    ("model", "app.model", "MQTT-Pub-Py"),
+    ("sw_version", "app.sw_version", None),
+    ("hw_version", "app.hw_version", None),
+    ("configuration_url", "app.configuration_url", None),
+    ("connections", "app.connections", None),
+    ("suggested_area", "app.suggested_area", None),
+    ("via_device", "app.via_device", None),
+    ("model_id", "app.model_id", None),
+    ("serial_number", "app.serial_number", None),
+)
+
 
 class Device:
     """
@@ -17,6 +32,8 @@ class Device:
     https://www.home-assistant.io/integrations/mqtt/#device-registry
     """
 
+    __slots__ = ("_config", "identifiers", *(name for name, _, _ in _CONFIG_FIELDS))
+
     def __init__(self, config, **kwargs):
         """
         Initializes the Device object.
@@ -28,33 +45,18 @@ class Device:
         self._config = config
 
         # Required fields
-        self.identifiers = kwargs.get(
-            "identifiers", [self._config.get("app.unique_id_prefix", "mqtt_publisher")]
-        )
-        self.name = kwargs.get("name", self._config.get("app.name", "MQTT Publisher"))
+        if "identifiers" in kwargs:
+            self.identifiers = kwargs["identifiers"]
+        else:
+            self.identifiers = [config.get("app.unique_id_prefix", "mqtt_publisher")]
 
-        # Optional fields with config fallbacks
-        self.manufacturer = kwargs.get(
-            "manufacturer",
-            self._config.get("app.manufacturer", "Generic MQTT Publisher"),
-        )
-        self.model = kwargs.get("model", self._config.get("app.model", "MQTT-Pub-Py"))
-        self.sw_version = kwargs.get("sw_version", self._config.get("app.sw_version"))
-        self.hw_version = kwargs.get("hw_version", self._config.get("app.hw_version"))
-        self.configuration_url = kwargs.get(
-            "configuration_url", self._config.get("app.configuration_url")
-        )
-        self.connections = kwargs.get(
-            "connections", self._config.get("app.connections")
-        )
-        self.suggested_area = kwargs.get(
-            "suggested_area", self._config.get("app.suggested_area")
-        )
-        self.via_device = kwargs.get("via_device", self._config.get("app.via_device"))
-        self.model_id = kwargs.get("model_id", self._config.get("app.model_id"))
-        self.serial_number = kwargs.get(
-            "serial_number", self._config.get("app.serial_number")
-        )
+        # Remaining fields: explicit kwargs win, otherwise fall back to config.
+        # The config is only consulted for fields that were not passed in.
+        for name, config_key, default in _CONFIG_FIELDS:
+            if name in kwargs:
+                setattr(self, name, kwargs[name])
+            else:
+                setattr(self, name, config.get(config_key, default))
 
     def get_device_info(self) -> dict:
         """
@@ -62,28 +64,33 @@ class Device:
         in the discovery payload for each entity. Only includes fields that
         have been set (not None).
         """
+        # Fields are read directly rather than via a getattr() loop; the
+        # identifier-like key literals are interned by the compiler.
         device_info = {
             "identifiers": self.identifiers,
             "name": self.name,
         }
 
         # Add optional fields only if they have values
-        optional_fields = [
-            "manufacturer",
-            "model",
-            "sw_version",
-            "hw_version",
-            "configuration_url",
-            "connections",
-            "suggested_area",
-            "via_device",
-            "model_id",
-            "serial_number",
-        ]
-
-        for field in optional_fields:
-            value = getattr(self, field, None)
-            if value is not None:
-                device_info[field] = value
+        if (value := self.manufacturer) is not None:
+            device_info["manufacturer"] = value
+        if (value := self.model) is not None:
+            device_info["model"] = value
+        if (value := self.sw_version) is not None:
+            device_info["sw_version"] = value
+        if (value := self.hw_version) is not None:
+            device_info["hw_version"] = value
+        if (value := self.configuration_url) is not None:
+            device_info["configuration_url"] = value
+        if (value := self.connections) is not None:
+            device_info["connections"] = value
+        if (value := self.suggested_area) is not None:
+            device_info["suggested_area"] = value
+        if (value := self.via_device) is not None:
+            device_info["via_device"] = value
+        if (value := self.model_id) is not None:
+            device_info["model_id"] = value
+        if (value := self.serial_number) is not None:
+            device_info["serial_number"] = value
 
         return device_info
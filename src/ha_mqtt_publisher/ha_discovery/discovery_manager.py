@@ -7,13 +7,115 @@ This module provides advanced discovery lifecycle management including
 entity removal, updates, and discovery scanning.
 """
 
-import json
+import asyncio
 import logging
 from typing import Any
 
+from .. import json_utils
 from .device import Device
 from .entity import Entity
 
+logger = logging.getLogger(__name__)
+
+
+class _EntityRegistry(dict):
+    """unique_id -> Entity mapping that also indexes entities by device.
+
+    Every write path of the dict keeps the index current, so code that fills
+    ``DiscoveryManager.entities`` directly stays consistent with it. Devices
+    are keyed by identity, matching ``entity.device == device`` for Device
+    objects (which do not define ``__eq__``).
+    """
+
+    __slots__ = ("_by_device", "_device_of")
+
+    def __init__(self):
+        super().__init__()
+        # id(device) -> unique_ids (a dict used as an insertion-ordered set)
+        self._by_device: dict[int, dict[str, None]] = {}
+        self._device_of: dict[str, int] = {}
+
+    def __setitem__(self, unique_id, entity):
+        super().__setitem__(unique_id, entity)
+        self._unlink(unique_id)
+        key = id(getattr(entity, "device", None))
+        self._device_of[unique_id] = key
+        self._by_device.setdefault(key, {})[unique_id] = None
+
+    def __delitem__(self, unique_id):
+        super().__delitem__(unique_id)
+        self._unlink(unique_id)
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def pop(self, unique_id, *default):
+        value = super().pop(unique_id, *default)
+        self._unlink(unique_id)
+        return value
+
+    def popitem(self):
+        unique_id, entity = super().popitem()
+        self._unlink(unique_id)
+        return unique_id, entity
+
+    def setdefault(self, unique_id, default=None):
+        if unique_id not in self:
+            self[unique_id] = default
+        return self[unique_id]
+
+    def update(self, *args, **kwargs):
+        for unique_id, entity in dict(*args, **kwargs).items():
+            self[unique_id] = entity
+
+    def clear(self):
+        super().clear()
+        self._by_device.clear()
+        self._device_of.clear()
+
+    def device_uids(self, device) -> list[str]:
+        """Keys of entities whose ``device`` is ``device``, in insertion order.
+
+        Assigning ``entity.device`` without re-storing the entity bypasses the
+        index. An empty or stale index entry falls back to a full
+        :meth:`reindex`; call it directly after moving entities onto a device
+        that already has indexed entities.
+        """
+        uids = self._by_device.get(id(device))
+        if uids:
+            found = [uid for uid in uids if self[uid].device is device]
+            if len(found) == len(uids):
+                return found
+        if not self:
+            return []
+        self.reindex()
+        return list(self._by_device.get(id(device), ()))
+
+    def reindex(self) -> None:
+        """Rebuild the device index from each entity's current ``device``."""
+        by_device: dict[int, dict[str, None]] = {}
+        device_of: dict[str, int] = {}
+        for unique_id, entity in self.items():
+            key = id(getattr(entity, "device", None))
+            device_of[unique_id] = key
+            by_device.setdefault(key, {})[unique_id] = None
+        self._by_device = by_device
+        self._device_of = device_of
+
+    def for_device(self, device) -> list[Entity]:
+        """Entities whose ``device`` is ``device``, in insertion order."""
+        return [self[uid] for uid in self.device_uids(device)]
+
+    def _unlink(self, unique_id):
+        key = self._device_of.pop(unique_id, None)
+        if key is None:
+            return
+        uids = self._by_device[key]
+        del uids[unique_id]
+        if not uids:
+            del self._by_device[key]
+
 
 class DiscoveryManager:
     """
@@ -23,6 +125,8 @@ class DiscoveryManager:
     discovery configurations for entities and devices.
     """
 
+    __slots__ = ("config", "devices", "discovery_prefix", "entities", "publisher")
+
     def __init__(self, config, publisher):
         """
         Initialize the Discovery Manager.
@@ -33,7 +137,7 @@ class DiscoveryManager:
         """
         self.config = config
         self.publisher = publisher
-        self.entities: dict[str, Entity] = {}
+        self.entities: dict[str, Entity] = _EntityRegistry()
         self.devices: dict[str, Device] = {}
         self.discovery_prefix = config.get(
             "home_assistant.discovery_prefix", "homeassistant"
@@ -52,24 +156,83 @@ class DiscoveryManager:
         try:
             # Store entity
             self.entities[entity.unique_id] = entity
+            config_topic, config_payload = self._discovery_message(entity)
+        except Exception as e:
+            logger.error("Error adding entity: %s", e)
+            return False
 
-            # Publish discovery configuration
-            config_topic = entity.get_config_topic()
-            config_payload = entity.get_config_payload()
+        return self._publish_discovery(entity, config_topic, config_payload)
 
+    def publish_batch(self, entities) -> bool:
+        """
+        Add several entities and publish their discovery configurations.
+
+        Every payload is serialized before the first publish so the messages
+        are queued on the client back-to-back. An entity that fails to
+        serialize or publish does not stop the rest of the batch.
+
+        Args:
+            entities: Entities to add
+
+        Returns:
+            bool: True if every entity was published
+        """
+        success = True
+        messages = []
+        registry = self.entities
+        discovery_message = self._discovery_message
+        for entity in entities:
+            try:
+                registry[entity.unique_id] = entity
+                messages.append((entity, *discovery_message(entity)))
+            except Exception as e:
+                logger.error("Error adding entity: %s", e)
+                success = False
+
+        publish_discovery = self._publish_discovery
+        for entity, config_topic, config_payload in messages:
+            if not publish_discovery(entity, config_topic, config_payload):
+                success = False
+        return success
+
+    def _discovery_message(self, entity: Entity) -> tuple[str, bytes]:
+        """Return the discovery (topic, JSON payload) for an entity.
+
+        The encoded message is cached on the entity and reused until
+        ``entity.invalidate_discovery()`` bumps its version. Objects without
+        an integer ``_version`` (stand-ins for Entity) are encoded every time.
+        """
+        version = getattr(entity, "_version", None)
+        if not isinstance(version, int):
+            return entity.get_config_topic(), json_utils.dumps(
+                entity.get_config_payload()
+            )
+        cached = entity._discovery_cache
+        if cached is not None and cached[0] == version:
+            return cached[1], cached[2]
+        config_topic = entity.get_config_topic()
+        config_payload = json_utils.dumps(entity.get_config_payload())
+        entity._discovery_cache = (version, config_topic, config_payload)
+        return config_topic, config_payload
+
+    def _publish_discovery(
+        self, entity: Entity, config_topic: str, config_payload: bytes
+    ) -> bool:
+        try:
             success = self.publisher.publish(
-                topic=config_topic, payload=json.dumps(config_payload), retain=True
+                topic=config_topic, payload=config_payload, retain=True
             )
 
             if success:
-                logging.info(f"Added entity '{entity.name}' ({entity.unique_id})")
+                entity._discovery_published = (config_topic, config_payload)
+                logger.info("Added entity '%s' (%s)", entity.name, entity.unique_id)
             else:
-                logging.error(f"Failed to add entity '{entity.name}'")
+                logger.error("Failed to add entity '%s'", entity.name)
 
             return success
 
         except Exception as e:
-            logging.error(f"Error adding entity: {e}")
+            logger.error("Error adding entity: %s", e)
             return False
 
     def remove_entity(self, unique_id: str) -> bool:
@@ -85,7 +248,7 @@ class DiscoveryManager:
         try:
             entity = self.entities.get(unique_id)
             if not entity:
-                logging.warning(f"Entity '{unique_id}' not found")
+                logger.warning("Entity '%s' not found", unique_id)
                 return False
 
             # Publish empty payload to remove entity
@@ -96,21 +259,25 @@ class DiscoveryManager:
 
             if success:
                 # Remove from local tracking
+                entity._discovery_published = None
                 del self.entities[unique_id]
-                logging.info(f"Removed entity '{entity.name}' ({unique_id})")
+                logger.info("Removed entity '%s' (%s)", entity.name, unique_id)
             else:
-                logging.error(f"Failed to remove entity '{entity.name}'")
+                logger.error("Failed to remove entity '%s'", entity.name)
 
             return success
 
         except Exception as e:
-            logging.error(f"Error removing entity: {e}")
+            logger.error("Error removing entity: %s", e)
             return False
 
     def update_entity(self, unique_id: str, **kwargs) -> bool:
         """
         Update an entity's configuration and republish discovery.
 
+        The publish is skipped when the resulting discovery topic and
+        payload equal the ones last published successfully for the entity.
+
         Args:
             unique_id: Unique ID of the entity to update
             **kwargs: Fields to update
@@ -121,7 +288,7 @@ class DiscoveryManager:
         try:
             entity = self.entities.get(unique_id)
             if not entity:
-                logging.warning(f"Entity '{unique_id}' not found")
+                logger.warning("Entity '%s' not found", unique_id)
                 return False
 
             # Update entity attributes
@@ -130,12 +297,19 @@ class DiscoveryManager:
                     setattr(entity, key, value)
                 else:
                     entity.extra_attributes[key] = value
+            entity.invalidate_discovery()
 
             # Republish discovery configuration
-            return self.add_entity(entity)
+            self.entities[entity.unique_id] = entity
+            # Compare the encoded bytes, not dicts: 1 == True == 1.0 would
+            # otherwise hide a changed value and skip the republish
+            config_topic, encoded = self._discovery_message(entity)
+            if entity._discovery_published == (config_topic, encoded):
+                return True
+            return self._publish_discovery(entity, config_topic, encoded)
 
         except Exception as e:
-            logging.error(f"Error updating entity: {e}")
+            logger.error("Error updating entity: %s", e)
             return False
 
     def add_device(self, device: Device) -> bool:
@@ -151,11 +325,11 @@ class DiscoveryManager:
         try:
             device_id = device.identifiers[0] if device.identifiers else device.name
             self.devices[device_id] = device
-            logging.info(f"Added device '{device.name}' ({device_id})")
+            logger.info("Added device '%s' (%s)", device.name, device_id)
             return True
 
         except Exception as e:
-            logging.error(f"Error adding device: {e}")
+            logger.error("Error adding device: %s", e)
             return False
 
     def remove_device(self, device_id: str) -> bool:
@@ -171,13 +345,11 @@ class DiscoveryManager:
         try:
             device = self.devices.get(device_id)
             if not device:
-                logging.warning(f"Device '{device_id}' not found")
+                logger.warning("Device '%s' not found", device_id)
                 return False
 
             # Remove all entities belonging to this device
-            entities_to_remove = [
-                uid for uid, entity in self.entities.items() if entity.device == device
-            ]
+            entities_to_remove = self.entities.device_uids(device)
 
             success = True
             for uid in entities_to_remove:
@@ -187,12 +359,12 @@ class DiscoveryManager:
             # Remove device from tracking
             if success:
                 del self.devices[device_id]
-                logging.info(f"Removed device '{device.name}' ({device_id})")
+                logger.info("Removed device '%s' (%s)", device.name, device_id)
 
             return success
 
         except Exception as e:
-            logging.error(f"Error removing device: {e}")
+            logger.error("Error removing device: %s", e)
             return False
 
     def get_device_entities(self, device_id: str) -> list[Entity]:
@@ -209,7 +381,7 @@ class DiscoveryManager:
         if not device:
             return []
 
-        return [entity for entity in self.entities.values() if entity.device == device]
+        return self.entities.for_device(device)
 
     def publish_all_discoveries(self) -> bool:
         """
@@ -218,11 +390,28 @@ class DiscoveryManager:
         Returns:
             bool: Success status
         """
-        success = True
-        for entity in self.entities.values():
-            if not self.add_entity(entity):
-                success = False
-        return success
+        return self.publish_batch(list(self.entities.values()))
+
+    async def publish_all_discoveries_async(self) -> bool:
+        """
+        Awaitable publish_all_discoveries() for asyncio applications.
+
+        The batch runs in a worker thread so payload encoding and the
+        publisher calls don't block the event loop.
+
+        Returns:
+            bool: Success status
+        """
+        return await asyncio.to_thread(self.publish_all_discoveries)
+
+    async def clear_all_discoveries_async(self) -> bool:
+        """
+        Awaitable clear_all_discoveries() for asyncio applications.
+
+        Returns:
+            bool: Success status
+        """
+        return await asyncio.to_thread(self.clear_all_discoveries)
 
     def clear_all_discoveries(self) -> bool:
         """
@@ -253,7 +442,10 @@ class DiscoveryManager:
         entity = self.entities.get(unique_id)
         if not entity:
             return None
+        return self._entity_status(entity)
 
+    @staticmethod
+    def _entity_status(entity: Entity) -> dict[str, Any]:
         return {
             "unique_id": entity.unique_id,
             "name": entity.name,
@@ -272,11 +464,8 @@ class DiscoveryManager:
         Returns:
             List of entity status dictionaries
         """
-        return [
-            status
-            for status in (self.get_entity_status(uid) for uid in self.entities.keys())
-            if status is not None
-        ]
+        entity_status = self._entity_status
+        return [entity_status(entity) for entity in self.entities.values() if entity]
 
     def list_devices(self) -> list[dict[str, Any]]:
         """
@@ -286,8 +475,9 @@ class DiscoveryManager:
             List of device information dictionaries
         """
         devices = []
+        device_uids = self.entities.device_uids
         for device_id, device in self.devices.items():
-            entity_count = len(self.get_device_entities(device_id))
+            entity_count = len(device_uids(device)) if device else 0
             devices.append(
                 {
                     "device_id": device_id,
@@ -10,10 +10,21 @@ originally developed in twickenham_events, with generic patterns for:
 
 from __future__ import annotations
 
-import json
+from collections.abc import Sequence
 
+from .. import json_utils
 from .device import Device
 from .entity import Button, Entity, Sensor
+from .publisher import _entity_to_component_payload
+
+_STANDARD_BUTTONS = ("refresh", "clear_cache", "restart")
+_BUTTON_ICONS = {
+    "refresh": "mdi:refresh",
+    "clear_cache": "mdi:delete-sweep",
+    "restart": "mdi:restart",
+    "reload": "mdi:reload",
+    "reset": "mdi:backup-restore",
+}
 
 
 def publish_device_level_discovery(
@@ -46,8 +57,6 @@ def publish_device_level_discovery(
     Returns:
         The published device topic string
     """
-    from .publisher import _entity_to_component_payload
-
     discovery_prefix = config.get("home_assistant.discovery_prefix", "homeassistant")
     base = config.get("app.unique_id_prefix", config.get("app.name", "mqtt_publisher"))
 
@@ -59,28 +68,28 @@ def publish_device_level_discovery(
             device_id = base
 
     device_topic = f"{discovery_prefix}/device/{device_id}/config"
+    default_qos = config.get("mqtt.default_qos", 0)
+    # Built fresh on every call, so one copy serves both "o" and "dev"
+    dev_info = device.get_device_info()
 
     # Build origin block
     origin = {
         "name": base,
-        "sw": device.get_device_info().get("sw_version", "unknown"),
-        "url": device.get_device_info().get("configuration_url"),
+        "sw": dev_info.get("sw_version", "unknown"),
+        "url": dev_info.get("configuration_url"),
     }
 
     # Build cmps from entities using the library's conversion function
     cmps: dict[str, dict] = {}
     state_topics = set()
+    uid_prefix = f"{base}_"
 
     for entity in entities:
         # Convert Entity to component payload (removes device, adds 'p' for component type)
         comp_payload = _entity_to_component_payload(entity)
 
-        # Use unique_id as the key for stable references
-        key = (
-            entity.unique_id.replace(f"{base}_", "", 1)
-            if entity.unique_id.startswith(f"{base}_")
-            else entity.unique_id
-        )
+        # Key by unique_id without the app prefix for stable references
+        key = entity.unique_id.removeprefix(uid_prefix)
         cmps[key] = comp_payload
 
         # Track state topics for potential common topic detection
@@ -89,10 +98,10 @@ def publish_device_level_discovery(
 
     # Build the device bundle payload
     payload = {
-        "dev": device.get_device_info(),
+        "dev": dev_info,
         "o": origin,
         "cmps": cmps,
-        "qos": config.get("mqtt.default_qos", 0),
+        "qos": default_qos,
     }
 
     # Add availability configuration if provided
@@ -107,16 +116,17 @@ def publish_device_level_discovery(
 
     # Handle migration from per-entity discovery
     if migrate_from_per_entity:
-        # Publish migration markers first
-        for entity in entities:
+        # Publish migration markers first. The marker topic depends only on
+        # the component, so entities sharing one get a single retained marker.
+        marker_payload = json_utils.dumps({"migrated_to": device_topic})
+        for component in dict.fromkeys(entity.component for entity in entities):
             marker_topic = (
-                f"{discovery_prefix}/{entity.component}/{device_id}/migrate_discovery"
+                f"{discovery_prefix}/{component}/{device_id}/migrate_discovery"
             )
-            marker_payload = json.dumps({"migrated_to": device_topic})
             publisher.publish(marker_topic, marker_payload, retain=True)
 
     # Publish the device bundle
-    payload_json = json.dumps(payload)
+    payload_json = json_utils.dumps(payload)
     publisher.publish(device_topic, payload_json, retain=retain)
 
     # Clean up old per-entity topics if migrating
@@ -213,7 +223,7 @@ def create_standard_buttons(
     device: Device,
     base_prefix: str,
     command_topic_base: str,
-    button_names: list[str] | None = None,
+    button_names: Sequence[str] | None = None,
 ) -> list[Entity]:
     """
     Create standard button entities (refresh, clear_cache, restart) as Entity objects.
@@ -229,7 +239,7 @@ def create_standard_buttons(
         List of Button Entity objects
     """
     if button_names is None:
-        button_names = ["refresh", "clear_cache", "restart"]
+        button_names = _STANDARD_BUTTONS
 
     entities = []
 
@@ -250,11 +260,4 @@ def create_standard_buttons(
 
 def _get_button_icon(button_name: str) -> str:
     """Get appropriate MDI icon for standard button names."""
-    icon_map = {
-        "refresh": "mdi:refresh",
-        "clear_cache": "mdi:delete-sweep",
-        "restart": "mdi:restart",
-        "reload": "mdi:reload",
-        "reset": "mdi:backup-restore",
-    }
-    return icon_map.get(button_name, "mdi:gesture-tap-button")
+    return _BUTTON_ICONS.get(button_name, "mdi:gesture-tap-button")
@@ -30,16 +30,55 @@ logger = logging.getLogger(__name__)
 """Allowed values are imported from constants for single source of truth."""
 
 
-def _slugify_object_id(value: str) -> str:
+# Optional attributes copied into the discovery payload when set
+_OPTIONAL_PAYLOAD_ATTRS = (
+    "availability_topic",
+    "availability_mode",
+    "availability_template",
+    "device_class",
+    "enabled_by_default",
+    "encoding",
+    "entity_category",
+    "icon",
+    "json_attributes_template",
+    "json_attributes_topic",
+    "payload_available",
+    "payload_not_available",
+    "qos",
+    "retain",
+    "state_class",
+    "unit_of_measurement",
+    "value_template",
+)
+
+_SLUG_SEPARATORS = re.compile(r"[\s\-]+")
+_SLUG_INVALID = re.compile(r"[^a-z0-9_]")
+_SLUG_UNDERSCORES = re.compile(r"_+")
+# ASCII-only equivalent of the first two passes: whitespace and "-" become
+# "_", everything else outside [a-z0-9_] is dropped
+_SLUG_ASCII_TABLE = {
+    code: "_" if chr(code).isspace() or chr(code) == "-" else None
+    for code in range(128)
+    if _SLUG_INVALID.match(chr(code))
+}
+
+
+def _slugify_object_id(value: str, default: str = "entity") -> str:
     """Create a HA-friendly object_id: lowercase, alnum+underscore only."""
     value = value.strip().lower()
+    if value.isascii():
+        # Common case: one translate pass, then collapse underscore runs
+        value = value.translate(_SLUG_ASCII_TABLE)
+        while "__" in value:
+            value = value.replace("__", "_")
+        return value.strip("_") or default
     # Replace spaces and separators with underscores
-    value = re.sub(r"[\s\-]+", "_", value)
+    value = _SLUG_SEPARATORS.sub("_", value)
     # Remove invalid chars
-    value = re.sub(r"[^a-z0-9_]", "", value)
+    value = _SLUG_INVALID.sub("", value)
     # Collapse multiple underscores
-    value = re.sub(r"_+", "_", value).strip("_")
-    return value or "entity"
+    value = _SLUG_UNDERSCORES.sub("_", value).strip("_")
+    return value or default
 
 
 class Entity:
@@ -52,6 +91,14 @@ class Entity:
     by setting the component type and providing the appropriate fields.
     """
 
+    # The (topic, encoded payload) last published successfully; compared as
+    # bytes so e.g. 1 -> True still counts as a change (see DiscoveryManager)
+    _discovery_published: tuple[str, bytes] | None = None
+    # Bumped by invalidate_discovery(); the (version, topic, encoded payload)
+    # cache below is reused by DiscoveryManager while the versions match
+    _version: int = 0
+    _discovery_cache: tuple[int, str, bytes] | None = None
+
     def __init__(self, config, device: Device, component="sensor", **kwargs):
         """
         Initializes the base Entity.
@@ -105,25 +152,23 @@ class Entity:
         # Allow users to extend allowed sets via config
         extras = self._config.get("home_assistant.extra_allowed", {}) or {}
 
-        def _to_set(val):
-            if isinstance(val, list | set | tuple):
-                return set(val)
-            return set()
-
-        allowed_entity_categories = ENTITY_CATEGORIES | _to_set(
-            extras.get("entity_categories")
-        )
-        allowed_availability_modes = AVAILABILITY_MODES | _to_set(
-            extras.get("availability_modes")
-        )
-        allowed_sensor_state_classes = SENSOR_STATE_CLASSES | _to_set(
-            extras.get("sensor_state_classes")
+        def _allowed(base, key):
+            # Only build a new set when the config actually extends the defaults
+            val = extras.get(key)
+            if isinstance(val, list | set | tuple) and val:
+                return base | set(val)
+            return base
+
+        allowed_entity_categories = _allowed(ENTITY_CATEGORIES, "entity_categories")
+        allowed_availability_modes = _allowed(AVAILABILITY_MODES, "availability_modes")
+        allowed_sensor_state_classes = _allowed(
+            SENSOR_STATE_CLASSES, "sensor_state_classes"
         )
-        allowed_sensor_device_classes = SENSOR_DEVICE_CLASSES | _to_set(
-            extras.get("sensor_device_classes")
+        allowed_sensor_device_classes = _allowed(
+            SENSOR_DEVICE_CLASSES, "sensor_device_classes"
         )
-        allowed_binary_sensor_device_classes = BINARY_SENSOR_DEVICE_CLASSES | _to_set(
-            extras.get("binary_sensor_device_classes")
+        allowed_binary_sensor_device_classes = _allowed(
+            BINARY_SENSOR_DEVICE_CLASSES, "binary_sensor_device_classes"
         )
 
         if (
@@ -170,6 +215,16 @@ class Entity:
                 raise ValueError(msg)
             logger.warning(msg)
 
+    def invalidate_discovery(self) -> None:
+        """
+        Marks the entity's discovery message as changed.
+
+        DiscoveryManager reuses the encoded discovery JSON until this is
+        called; update_entity() calls it for you. Call it after changing
+        attributes, extra_attributes or the device in place.
+        """
+        self._version += 1
+
     def get_config_topic(self) -> str:
         """
         Generates the MQTT topic for publishing the entity's discovery configuration.
@@ -181,7 +236,15 @@ class Entity:
         return f"{discovery_prefix}/{self.component}/{self.unique_id}/config"
 
     def get_config_payload(self) -> dict:
-        """Returns the complete configuration payload for this entity."""
+        """
+        Returns the complete configuration payload for this entity.
+
+        A new dict is built on every call, so callers may modify the result.
+        """
+        return self._build_config_payload(include_device=True)
+
+    def _build_config_payload(self, include_device: bool) -> dict:
+        """Build the payload, optionally without the per-entity device block."""
         # Construct a globally unique ID and a clean object ID
         prefix = self._config.get("app.unique_id_prefix", "mqtt_publisher")
         computed_uid = f"{prefix}_{self.unique_id}"
@@ -192,8 +255,9 @@ class Entity:
             # Preserve unique_id for registry stability; slugify object_id only
             "unique_id": computed_uid,
             "object_id": safe_object_id,
-            "device": self.device.get_device_info(),
         }
+        if include_device:
+            payload["device"] = self.device.get_device_info()
 
         # Add required topics
         if self.state_topic:
@@ -202,27 +266,7 @@ class Entity:
             payload["command_topic"] = self.command_topic
 
         # Add optional common attributes only if they have values
-        optional_attrs = [
-            "availability_topic",
-            "availability_mode",
-            "availability_template",
-            "device_class",
-            "enabled_by_default",
-            "encoding",
-            "entity_category",
-            "icon",
-            "json_attributes_template",
-            "json_attributes_topic",
-            "payload_available",
-            "payload_not_available",
-            "qos",
-            "retain",
-            "state_class",
-            "unit_of_measurement",
-            "value_template",
-        ]
-
-        for attr in optional_attrs:
+        for attr in _OPTIONAL_PAYLOAD_ATTRS:
             value = getattr(self, attr, None)
             if value is not None:
                 payload[attr] = value
@@ -9,25 +9,42 @@ to MQTT brokers for Home Assistant auto-discovery.
 
 from __future__ import annotations
 
+from contextlib import nullcontext
+from datetime import datetime
 import json
-import time
+import logging
+import os
+import threading
 from typing import Any
 
+from .. import json_utils
 from .constants import AvailabilityMode, EntityCategory, SensorStateClass
 from .device import Device
-from .entity import Button, Entity, Sensor
+from .entity import Button, Entity, Sensor, _slugify_object_id
 from .status_sensor import StatusSensor
 
+logger = logging.getLogger(__name__)
+
+# Parsed discovery state keyed by absolute path -> ((st_mtime_ns, st_size), state)
+_STATE_CACHE: dict[str, tuple[tuple[int, int], dict]] = {}
+
 
 def _slugify(value: str) -> str:
     """Create a HA-friendly slug: lowercase, alnum+underscore only."""
-    import re
+    return _slugify_object_id(value, default="device")
 
-    value = value.strip().lower()
-    value = re.sub(r"[\s\-]+", "_", value)
-    value = re.sub(r"[^a-z0-9_]", "", value)
-    value = re.sub(r"_+", "_", value).strip("_")
-    return value or "device"
+
+def _bundle_topic(
+    config, device: Device, device_id: str | None = None
+) -> tuple[str, str]:
+    """Resolve the device id and its ``<prefix>/device/<device_id>/config`` topic."""
+    if not device_id:
+        if isinstance(device.identifiers, list) and device.identifiers:
+            device_id = str(device.identifiers[0])
+        else:
+            device_id = _slugify(device.name)
+    discovery_prefix = config.get("home_assistant.discovery_prefix", "homeassistant")
+    return device_id, f"{discovery_prefix}/device/{device_id}/config"
 
 
 def publish_discovery_configs(
@@ -39,6 +56,7 @@ def publish_discovery_configs(
     *,
     emit_device_bundle: bool = False,
     device_id: str | None = None,
+    bundle_only: bool | None = None,
 ):
     """
     Publishes the MQTT discovery configurations for all defined entities.
@@ -49,6 +67,8 @@ def publish_discovery_configs(
         entities: Optional list of entities to publish. If None, creates default entities.
         device: Optional Device instance. If None, creates a new device.
         one_time_mode: If True, only publish if not already published (default: False)
+        bundle_only: Publish a single device bundle instead of one config per
+            entity. None (default) uses home_assistant.bundle_only_mode.
     """
     if not config.get("home_assistant.enabled", True):
         return
@@ -66,7 +86,9 @@ def publish_discovery_configs(
             entities.append(StatusSensor(config, device))
 
     # Determine bundle-only behavior (default False for backward compatibility)
-    bundle_only_mode = bool(config.get("home_assistant.bundle_only_mode", False))
+    if bundle_only is None:
+        bundle_only = config.get("home_assistant.bundle_only_mode", False)
+    bundle_only_mode = bool(bundle_only)
 
     # Optionally run a verification pass to heal missing retained configs
     # Only when explicitly enabled and when publisher supports subscriptions.
@@ -89,9 +111,10 @@ def publish_discovery_configs(
                     config.get("home_assistant.ensure_discovery_timeout", 2.0)
                 ),
                 one_time_mode=True,
+                bundle_only=bundle_only_mode,
             )
         except Exception as exc:
-            print(f"Warning: ensure_discovery failed: {exc}")
+            logger.warning("ensure_discovery failed: %s", exc)
     elif (emit_device_bundle or bundle_only_mode) and entities:
         # If ensure_discovery isn't used, optionally emit or always emit device bundle first
         try:
@@ -103,12 +126,14 @@ def publish_discovery_configs(
                 device_id=device_id,
             )
         except Exception as exc:
-            print(f"Warning: device bundle publish failed: {exc}")
+            logger.warning("Device bundle publish failed: %s", exc)
 
     # If bundle-only mode, skip per-entity discovery publishes
     if bundle_only_mode:
         if one_time_mode:
-            print("One-time discovery mode (bundle-only): Per-entity configs skipped")
+            logger.info(
+                "One-time discovery mode (bundle-only): Per-entity configs skipped"
+            )
         return
 
     # Track published configs for one-time mode
@@ -116,98 +141,174 @@ def publish_discovery_configs(
     skipped_count = 0
 
     # Publish the discovery config for each entity
-    for entity in entities:
-        config_topic = entity.get_config_topic()
-        config_payload = entity.get_config_payload()
-
-        if one_time_mode and _is_discovery_already_published(config_topic, config):
-            print(f"Skipping already published discovery config: {config_topic}")
-            skipped_count += 1
-            continue
-
-        publisher.publish(
-            topic=config_topic, payload=json.dumps(config_payload), retain=True
-        )
-        print(f"Published discovery config to {config_topic}")
-        published_count += 1
+    with _DiscoveryState(config) if one_time_mode else nullcontext() as state:
+        for entity in entities:
+            config_topic = entity.get_config_topic()
+
+            # Check before building the payload so skipped entities cost a lookup
+            if one_time_mode and state.contains(config_topic):
+                logger.info(
+                    "Skipping already published discovery config: %s", config_topic
+                )
+                skipped_count += 1
+                continue
+
+            publisher.publish(
+                topic=config_topic,
+                payload=json_utils.dumps(entity.get_config_payload()),
+                retain=True,
+            )
+            logger.info("Published discovery config to %s", config_topic)
+            published_count += 1
 
-        # Mark as published for one-time mode
-        if one_time_mode:
-            _mark_discovery_as_published(config_topic, config)
+            # Mark as published for one-time mode
+            if one_time_mode:
+                state.add(config_topic)
 
     if one_time_mode:
-        print(
-            f"One-time discovery mode: Published {published_count}, Skipped {skipped_count}"
+        logger.info(
+            "One-time discovery mode: Published %d, Skipped %d",
+            published_count,
+            skipped_count,
         )
 
 
-def _is_discovery_already_published(config_topic, config):
+def _load_discovery_state(config):
     """
-    Check if a discovery config has already been published.
+    Read the one-time discovery state file.
 
     Args:
-        config_topic: The MQTT topic for the discovery config
         config: Configuration object
 
     Returns:
-        bool: True if already published, False otherwise
+        dict: State whose "published_topics" is an insertion-ordered dict used
+        as a set; empty if missing or unreadable
     """
-    import json
-    import os
-
-    # Get the discovery state file path
     state_file = config.get(
         "home_assistant.discovery_state_file", ".ha_discovery_state.json"
     )
+    # Reuse the last parse while the file's mtime and size are unchanged;
+    # callers get their own copy since they record topics into it
+    path = os.path.abspath(state_file)
+    try:
+        st = os.stat(path)
+    except OSError:
+        return {"published_topics": {}, "last_updated": None}
+    stamp = (st.st_mtime_ns, st.st_size)
 
-    if not os.path.exists(state_file):
-        return False
+    cached = _STATE_CACHE.get(path)
+    if cached is None or cached[0] != stamp:
+        try:
+            with open(path) as f:
+                state = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {"published_topics": {}, "last_updated": None}
+        state["published_topics"] = dict.fromkeys(state.get("published_topics", []))
+        cached = _STATE_CACHE[path] = (stamp, state)
 
-    try:
-        with open(state_file) as f:
-            published_configs = json.load(f)
-        return config_topic in published_configs.get("published_topics", [])
-    except (OSError, json.JSONDecodeError):
-        return False
+    state = cached[1]
+    return {**state, "published_topics": dict(state["published_topics"])}
 
 
-def _mark_discovery_as_published(config_topic, config):
+def _save_discovery_state(state, config):
     """
-    Mark a discovery config as published.
+    Write the one-time discovery state file atomically.
+
+    The state is written to a sibling temp file, synced to disk and moved
+    into place, so a crash mid-write never leaves a truncated state file
+    behind.
 
     Args:
-        config_topic: The MQTT topic for the discovery config
+        state: State dict as returned by _load_discovery_state
         config: Configuration object
     """
-    from datetime import datetime
-    import json
-    import os
-
-    # Get the discovery state file path
     state_file = config.get(
         "home_assistant.discovery_state_file", ".ha_discovery_state.json"
     )
-
-    # Load existing state
-    published_configs = {"published_topics": [], "last_updated": None}
-    if os.path.exists(state_file):
+    # Unique per writer so concurrent processes or threads never share a temp
+    tmp_file = f"{state_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+    _STATE_CACHE.pop(os.path.abspath(state_file), None)
+    try:
+        with open(tmp_file, "w") as f:
+            json.dump(
+                {**state, "published_topics": list(state["published_topics"])},
+                f,
+                indent=2,
+            )
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, state_file)
+    except OSError as exc:
+        logger.warning("Could not save discovery state: %s", exc)
         try:
-            with open(state_file) as f:
-                published_configs = json.load(f)
-        except (OSError, json.JSONDecodeError):
+            os.remove(tmp_file)
+        except OSError:
             pass
 
-    # Add the new topic if not already present
-    if config_topic not in published_configs.get("published_topics", []):
-        published_configs.setdefault("published_topics", []).append(config_topic)
-        published_configs["last_updated"] = datetime.now().isoformat()
 
-        # Save the updated state
-        try:
-            with open(state_file, "w") as f:
-                json.dump(published_configs, f, indent=2)
-        except OSError as exc:
-            print(f"Warning: Could not save discovery state: {exc}")
+class _DiscoveryState:
+    """
+    One-time discovery state held in memory for a publish cycle.
+
+    Loaded on entry; on exit the file is written once, and only if a topic
+    was added. The write also happens when the block raises, so topics
+    published before the error stay recorded.
+    """
+
+    __slots__ = ("_added", "_config", "_state")
+
+    def __init__(self, config):
+        self._config = config
+        self._state = None
+        self._added = False
+
+    def __enter__(self):
+        self._state = _load_discovery_state(self._config)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._added:
+            _save_discovery_state(self._state, self._config)
+        return False
+
+    def contains(self, config_topic) -> bool:
+        """Return True if ``config_topic`` is recorded as published."""
+        return config_topic in self._state["published_topics"]
+
+    def add(self, config_topic) -> None:
+        """Record ``config_topic`` as published."""
+        topics = self._state["published_topics"]
+        if config_topic not in topics:
+            topics[config_topic] = None
+            self._state["last_updated"] = datetime.now().isoformat()
+            self._added = True
+
+
+def _is_discovery_already_published(config_topic, config):
+    """
+    Check if a discovery config has already been published.
+
+    Args:
+        config_topic: The MQTT topic for the discovery config
+        config: Configuration object
+
+    Returns:
+        bool: True if already published, False otherwise
+    """
+    with _DiscoveryState(config) as state:
+        return state.contains(config_topic)
+
+
+def _mark_discovery_as_published(config_topic, config):
+    """
+    Mark a discovery config as published.
+
+    Args:
+        config_topic: The MQTT topic for the discovery config
+        config: Configuration object
+    """
+    with _DiscoveryState(config) as state:
+        state.add(config_topic)
 
 
 def clear_discovery_state(config):
@@ -217,20 +318,19 @@ def clear_discovery_state(config):
     Args:
         config: Configuration object
     """
-    import os
-
     state_file = config.get(
         "home_assistant.discovery_state_file", ".ha_discovery_state.json"
     )
+    _STATE_CACHE.pop(os.path.abspath(state_file), None)
 
     if os.path.exists(state_file):
         try:
             os.remove(state_file)
-            print(f"Cleared discovery state file: {state_file}")
+            logger.info("Cleared discovery state file: %s", state_file)
         except OSError as exc:
-            print(f"Warning: Could not remove discovery state file: {exc}")
+            logger.warning("Could not remove discovery state file: %s", exc)
     else:
-        print("Discovery state file does not exist")
+        logger.info("Discovery state file does not exist")
 
 
 def force_republish_discovery(config, publisher, entities=None, device=None):
@@ -256,6 +356,7 @@ def ensure_discovery(
     device_id: str | None = None,
     timeout: float = 2.0,
     one_time_mode: bool = False,
+    bundle_only: bool | None = None,
 ):
     """
     Verify retained discovery configs exist; republish any missing.
@@ -263,42 +364,45 @@ def ensure_discovery(
     - Subscribes to relevant discovery topics (bundle + per-entity).
     - Waits up to `timeout` for retained messages to arrive.
     - Republishes missing topics and optionally marks them "published" when one_time_mode.
+    - bundle_only overrides home_assistant.bundle_only_mode when not None.
 
     Returns a summary dict: {"seen": set[str], "missing": set[str], "republished": set[str]}.
     """
-    discovery_prefix = config.get("home_assistant.discovery_prefix", "homeassistant")
-
     topics_to_check: list[str] = []
 
     # Bundle topic (if device provided and bundle-only mode enabled)
-    bundle_only_mode = bool(config.get("home_assistant.bundle_only_mode", False))
+    if bundle_only is None:
+        bundle_only = config.get("home_assistant.bundle_only_mode", False)
+    bundle_only_mode = bool(bundle_only)
     bundle_topic: str | None = None
     if device is not None:
-        if not device_id:
-            if isinstance(device.identifiers, list) and device.identifiers:
-                device_id = str(device.identifiers[0])
-            else:
-                device_id = _slugify(device.name)
-        bundle_topic = f"{discovery_prefix}/device/{device_id}/config"
+        device_id, bundle_topic = _bundle_topic(config, device, device_id)
         # Always consider bundle if bundle_only_mode; otherwise we still check per-entity
         if bundle_only_mode:
             topics_to_check.append(bundle_topic)
 
-    # Entity topics
+    # Entity topics, resolved once and reused for the republish pass below
     entities = entities or []
-    if entities and not bundle_only_mode:
-        topics_to_check.extend([e.get_config_topic() for e in entities])
+    entity_topics = (
+        [e.get_config_topic() for e in entities] if not bundle_only_mode else []
+    )
+    topics_to_check.extend(entity_topics)
 
     if not topics_to_check:
         return {"seen": set(), "missing": set(), "republished": set()}
 
     seen: set[str] = set()
     republished: set[str] = set()
+    expected = set(topics_to_check)
+    all_seen = threading.Event()
 
-    # Callback to record seen topics
+    # Callback to record seen topics; wakes the wait below once all arrived
     def _on_msg(_client, _userdata, msg):  # pragma: no cover - tiny glue
         try:
-            seen.add(msg.topic)
+            if msg.topic in expected:
+                seen.add(msg.topic)
+                if len(seen) == len(expected):
+                    all_seen.set()
         except Exception:
             pass
 
@@ -310,10 +414,8 @@ def ensure_discovery(
             # Non-fatal; continue to try others
             pass
 
-    # Wait briefly or until all are seen
-    deadline = time.time() + max(0.05, float(timeout))
-    while time.time() < deadline and len(seen) < len(topics_to_check):
-        time.sleep(0.05)
+    # Wait until all are seen or the timeout expires
+    all_seen.wait(max(0.05, float(timeout)))
 
     # Unsubscribe
     for t in topics_to_check:
@@ -323,46 +425,44 @@ def ensure_discovery(
         except Exception:
             pass
 
-    missing = set(topics_to_check) - seen
+    missing = expected - seen
 
-    # Republish bundle if needed
-    if bundle_only_mode and bundle_topic and (bundle_topic in missing) and device:
-        try:
-            ok = publish_device_bundle(
-                config=config,
-                publisher=publisher,
-                device=device,
-                entities=entities,
-                device_id=device_id,
-            )
-            if ok:
-                republished.add(bundle_topic)
-                if one_time_mode:
-                    _mark_discovery_as_published(bundle_topic, config)
-        except Exception as exc:
-            print(f"Warning: failed to republish bundle discovery: {exc}")
+    with _DiscoveryState(config) if one_time_mode else nullcontext() as state:
+        # Republish bundle if needed
+        if bundle_only_mode and bundle_topic and (bundle_topic in missing) and device:
+            try:
+                ok = publish_device_bundle(
+                    config=config,
+                    publisher=publisher,
+                    device=device,
+                    entities=entities,
+                    device_id=device_id,
+                )
+                if ok:
+                    republished.add(bundle_topic)
+                    if one_time_mode:
+                        state.add(bundle_topic)
+            except Exception as exc:
+                logger.warning("Failed to republish bundle discovery: %s", exc)
 
-    # Republish missing per-entity topics
-    if entities and not bundle_only_mode:
-        for e in entities:
-            t = e.get_config_topic()
+        # Republish missing per-entity topics
+        for e, t in zip(entities, entity_topics, strict=False):
             if t in missing:
                 try:
                     payload = e.get_config_payload()
-                    publisher.publish(topic=t, payload=json.dumps(payload), retain=True)
+                    publisher.publish(
+                        topic=t, payload=json_utils.dumps(payload), retain=True
+                    )
                     republished.add(t)
                     if one_time_mode:
-                        _mark_discovery_as_published(t, config)
+                        state.add(t)
                 except Exception as exc:
-                    print(f"Warning: failed to republish discovery for {t}: {exc}")
+                    logger.warning("Failed to republish discovery for %s: %s", t, exc)
 
-    # Optionally mark seen topics as published in one-time mode
-    if one_time_mode:
-        for t in seen:
-            try:
-                _mark_discovery_as_published(t, config)
-            except Exception:
-                pass
+        # Optionally mark seen topics as published in one-time mode
+        if one_time_mode:
+            for t in seen:
+                state.add(t)
 
     return {"seen": seen, "missing": missing, "republished": republished}
 
@@ -391,29 +491,26 @@ def publish_device_config(
     Returns:
         bool: Success status from publisher.publish
     """
-    discovery_prefix = config.get("home_assistant.discovery_prefix", "homeassistant")
-
-    # Determine device_id for topic
-    if not device_id:
-        if isinstance(device.identifiers, list) and device.identifiers:
-            device_id = str(device.identifiers[0])
-        else:
-            device_id = _slugify(device.name)
-
-    topic = f"{discovery_prefix}/device/{device_id}/config"
+    device_id, topic = _bundle_topic(config, device, device_id)
     payload = device.get_device_info()
-    return publisher.publish(topic=topic, payload=json.dumps(payload), retain=retain)
+    return publisher.publish(
+        topic=topic, payload=json_utils.dumps(payload), retain=retain
+    )
 
 
 def _entity_to_component_payload(entity: Entity) -> dict:
     """Convert an Entity instance to a compact entity payload for bundle."""
-    payload = entity.get_config_payload().copy()
-
     # Map to compact keys where applicable (aligning with HA docs example terms):
     # - platform -> p (component type)
     # - unique_id kept as unique_id
     # Remove top-level device block; device is represented once in bundle
-    payload.pop("device", None)
+    if type(entity).get_config_payload is Entity.get_config_payload:
+        # Stock payload: skip building the device block only to drop it
+        payload = entity._build_config_payload(include_device=False)
+    else:
+        # get_config_payload() builds a new dict per call, so edit it in place
+        payload = entity.get_config_payload()
+        payload.pop("device", None)
 
     # Ensure component type key (p)
     payload["p"] = entity.component
@@ -446,24 +543,12 @@ def publish_device_bundle(
     Note: Entities still publish state/command at runtime; this replaces per-entity
     config publishes on modern HA versions that support the device bundle.
     """
-    discovery_prefix = config.get("home_assistant.discovery_prefix", "homeassistant")
+    device_id, topic = _bundle_topic(config, device, device_id)
 
-    # Determine device_id for topic
-    if not device_id:
-        if isinstance(device.identifiers, list) and device.identifiers:
-            device_id = str(device.identifiers[0])
-        else:
-            device_id = _slugify(device.name)
-
-    topic = f"{discovery_prefix}/device/{device_id}/config"
-
-    # Build cmps from entities keyed by their unique_id or object_id
-    cmps: dict[str, dict] = {}
-    for e in entities:
-        comp_payload = _entity_to_component_payload(e)
-        # Use the raw entity.unique_id as bundle key to keep keys stable and readable
-        key = e.unique_id
-        cmps[key] = comp_payload
+    # Build cmps keyed by the raw entity.unique_id to keep keys stable and readable
+    cmps: dict[str, dict] = {
+        e.unique_id: _entity_to_component_payload(e) for e in entities
+    }
 
     # Origin block (optional)
     origin = {
@@ -488,7 +573,9 @@ def publish_device_bundle(
     if default_retain is not None:
         bundle["retain"] = bool(default_retain)
 
-    return publisher.publish(topic=topic, payload=json.dumps(bundle), retain=retain)
+    return publisher.publish(
+        topic=topic, payload=json_utils.dumps(bundle), retain=retain
+    )
 
 
 def create_sensor(
@@ -571,7 +658,7 @@ def publish_command_buttons(
         )
         publisher.publish(
             topic=ent.get_config_topic(),
-            payload=json.dumps(ent.get_config_payload()),
+            payload=json_utils.dumps(ent.get_config_payload()),
             retain=True,
         )
         entities.append(ent)
@@ -26,6 +26,7 @@ class StatusSensor(BinarySensor):
             device: The Device object for HA discovery.
         """
         base_topic = config.get("mqtt.base_topic", "mqtt_publisher")
+        status_topic = f"{base_topic}/status"
 
         super().__init__(
             config,
@@ -33,8 +34,8 @@ class StatusSensor(BinarySensor):
             unique_id="status",
             name="Status",
             device_class="problem",
-            state_topic=f"{base_topic}/status",
+            state_topic=status_topic,
             value_template="{{ 'ON' if value_json.status == 'error' else 'OFF' }}",
-            json_attributes_topic=f"{base_topic}/status",
+            json_attributes_topic=status_topic,
             json_attributes_template="{{ value_json | tojson }}",
         )
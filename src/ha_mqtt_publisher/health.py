@@ -149,8 +149,13 @@ class HealthTracker:
         try:
             from .mqtt_utils import safe_on_connect, safe_on_disconnect
 
-            publisher.client.on_connect = safe_on_connect(wrapped_on_connect)
-            publisher.client.on_disconnect = safe_on_disconnect(wrapped_on_disconnect)
+            api_version = getattr(publisher.client, "_callback_api_version", None)
+            publisher.client.on_connect = safe_on_connect(
+                wrapped_on_connect, api_version=api_version
+            )
+            publisher.client.on_disconnect = safe_on_disconnect(
+                wrapped_on_disconnect, api_version=api_version
+            )
         except Exception:  # pragma: no cover - defensive
             publisher.client.on_connect = wrapped_on_connect
             publisher.client.on_disconnect = wrapped_on_disconnect
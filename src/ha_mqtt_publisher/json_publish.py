@@ -6,10 +6,12 @@ optional timestamp injection and debug logging.
 
 from __future__ import annotations
 
-import json
+from datetime import datetime, timezone
 import logging
 from typing import Any
 
+from . import json_utils
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,7 +26,7 @@ def publish_json(
     ts_value: str | None = None,
     debug: bool = False,
 ) -> None:
-    """Publish an object as JSON.
+    """Publish an object as compact JSON bytes (orjson when installed).
 
     - client: has publish(topic, payload, qos, retain)
     - ensure_ts_field: if provided and obj is a dict, inject ts_value under this key when missing
@@ -36,28 +38,40 @@ def publish_json(
         and isinstance(payload_obj, dict)
         and ensure_ts_field not in payload_obj
     ):
-        payload_obj = dict(payload_obj)
-        payload_obj[ensure_ts_field] = ts_value or _iso_now()
+        payload_obj = payload_obj | {ensure_ts_field: ts_value or _iso_now()}
     if debug:
         logger.debug("publish_json topic=%s payload=%s", topic, payload_obj)
-    client.publish(topic, json.dumps(payload_obj), qos=qos, retain=retain)
+    client.publish(topic, json_utils.dumps(payload_obj), qos=qos, retain=retain)
 
 
 def publish_many(
     client,
     messages: list[tuple[str, dict[str, Any] | list[Any], int, bool]],
     *,
+    ensure_ts_field: str | None = None,
+    ts_value: str | None = None,
     debug: bool = False,
 ) -> None:
     """Publish many JSON messages.
 
     messages: list of (topic, obj, qos, retain)
+    ensure_ts_field/ts_value: as for publish_json; when ts_value is None a single
+    timestamp is generated for the whole batch
     """
+    if ensure_ts_field and ts_value is None:
+        ts_value = _iso_now()
     for topic, obj, qos, retain in messages:
-        publish_json(client, topic, obj, qos=qos, retain=retain, debug=debug)
+        publish_json(
+            client,
+            topic,
+            obj,
+            qos=qos,
+            retain=retain,
+            ensure_ts_field=ensure_ts_field,
+            ts_value=ts_value,
+            debug=debug,
+        )
 
 
 def _iso_now() -> str:
-    from datetime import datetime, timezone
-
     return datetime.now(timezone.utc).isoformat()
@@ -0,0 +1,35 @@
+"""JSON encoding helpers shared by the MQTT publishing paths.
+
+Payloads are encoded straight to compact UTF-8 ``bytes``, which paho sends
+as-is. ``orjson`` is used when installed (``pip install
+"ha-mqtt-publisher[orjson]"``); otherwise the standard library ``json``
+module produces the same output shape.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+if orjson is not None:
+
+    def dumps(obj: Any) -> bytes:
+        """Encode ``obj`` as compact JSON bytes."""
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+    loads = orjson.loads
+else:  # pragma: no cover - exercised only without orjson
+    _encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+
+    def dumps(obj: Any) -> bytes:
+        """Encode ``obj`` as compact JSON bytes."""
+        return _encoder.encode(obj).encode()
+
+    loads = json.loads
+
+__all__ = ["dumps", "loads"]
@@ -7,9 +7,19 @@ so they are safe for library use.
 from typing import Any
 
 
+def _is_int_like(obj: Any) -> bool:
+    """Check if *obj* is an int or int-like (defines ``__int__``)."""
+    return isinstance(obj, int) or hasattr(obj, "__int__")
+
+
 def _is_reason_code(obj: Any) -> bool:
     """Check if *obj* is a paho ReasonCode (or int-like reason code)."""
-    if isinstance(obj, int) and not isinstance(obj, bool):
+    obj_type = type(obj)
+    if obj_type is int:
+        return True
+    if obj_type is bool or obj is None:
+        return False
+    if isinstance(obj, int):
         return True
     # paho 2.x ReasonCode has .value and .getName but no __int__
     if hasattr(obj, "value") and hasattr(obj, "getName"):
@@ -48,8 +58,9 @@ def extract_reason_code(*args: tuple[Any, ...], **kwargs: dict) -> Any | None:
             return a
 
     for key in ("reason_code", "rc"):
-        if key in kwargs and kwargs[key] is not None:
-            return kwargs[key]
+        value = kwargs.get(key)
+        if value is not None:
+            return value
 
     return None
 
@@ -60,29 +71,47 @@ def extract_properties(*args: tuple[Any, ...], **kwargs: dict) -> Any | None:
     Prefer explicit kw 'properties', else take the last positional arg that
     doesn't look like an int-like reason code.
     """
-    if "properties" in kwargs and kwargs["properties"] is not None:
-        return kwargs["properties"]
+    # paho passes everything positionally, so kwargs is usually empty
+    if kwargs:
+        properties = kwargs.get("properties")
+        if properties is not None:
+            return properties
 
     if args:
         last = args[-1]
-        if not (isinstance(last, int) or hasattr(last, "__int__")):
+        if not _is_int_like(last):
             return last
         if len(args) >= 2:
             cand = args[-2]
-            if not (isinstance(cand, int) or hasattr(cand, "__int__")):
+            if not _is_int_like(cand):
                 return cand
 
     return None
 
 
-def safe_on_connect(func):
+def _is_callback_api_v2(api_version: Any) -> bool:
+    """Return True if *api_version* is paho's ``CallbackAPIVersion.VERSION2``."""
+    return getattr(api_version, "name", api_version) == "VERSION2"
+
+
+def safe_on_connect(func, *, api_version: Any = None):
     """Decorator to normalize on_connect callbacks to (client, userdata, reason_code, properties).
 
+    When *api_version* is paho's ``CallbackAPIVersion.VERSION2`` the callback
+    shape is fixed, so arguments are forwarded directly instead of being
+    inspected on every call.
+
     Usage:
         @safe_on_connect
         def on_connect(client, userdata, reason_code, properties):
             ...
     """
+    if _is_callback_api_v2(api_version):
+
+        def v2_wrapper(client, userdata, flags, reason_code, properties=None):
+            return func(client, userdata, reason_code, properties)
+
+        return v2_wrapper
 
     def wrapper(client, userdata, *args, **kwargs):
         reason_code = extract_reason_code(*args, **kwargs)
@@ -92,11 +121,18 @@ def safe_on_connect(func):
     return wrapper
 
 
-def safe_on_disconnect(func):
+def safe_on_disconnect(func, *, api_version: Any = None):
     """Decorator to normalize on_disconnect callbacks to (client, userdata, reason_code, properties).
 
     Works for both v1 signature (client, userdata, rc) and v2 (client, userdata, reason_code, properties).
+    With ``api_version=CallbackAPIVersion.VERSION2`` arguments are forwarded directly.
     """
+    if _is_callback_api_v2(api_version):
+
+        def v2_wrapper(client, userdata, flags, reason_code, properties=None):
+            return func(client, userdata, reason_code, properties)
+
+        return v2_wrapper
 
     def wrapper(client, userdata, *args, **kwargs):
         reason_code = extract_reason_code(*args, **kwargs)
@@ -106,11 +142,18 @@ def safe_on_disconnect(func):
     return wrapper
 
 
-def safe_on_publish(func):
+def safe_on_publish(func, *, api_version: Any = None):
     """Decorator to normalize on_publish callbacks to (client, userdata, mid, reason_codes, properties).
 
     Supports v1 (client, userdata, mid) and v2 (client, userdata, mid, reason_codes, properties).
+    With ``api_version=CallbackAPIVersion.VERSION2`` arguments are forwarded directly.
     """
+    if _is_callback_api_v2(api_version):
+
+        def v2_wrapper(client, userdata, mid, reason_codes, properties=None):
+            return func(client, userdata, mid, reason_codes, properties)
+
+        return v2_wrapper
 
     def wrapper(client, userdata, *args, **kwargs):
         # mid is generally the first positional arg
@@ -127,7 +170,8 @@ def safe_on_publish(func):
             elif len(args) == 2:
                 # ambiguous: second arg might be reason_codes or properties; try to heuristically pick
                 cand = args[1]
-                if hasattr(cand, "__int__") or isinstance(cand, int):
+                # Also matches paho 2.x ReasonCode, which is not int-like
+                if _is_reason_code(cand):
                     reason_codes = cand
                 else:
                     properties = cand
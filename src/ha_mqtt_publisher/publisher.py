@@ -2,9 +2,11 @@ from __future__ import annotations
 
 import json
 import logging
+import random
+import re
 import ssl
 import time
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import paho.mqtt.client as mqtt
 
@@ -15,6 +17,9 @@ from ha_mqtt_publisher.mqtt_utils import (
     safe_on_publish,
 )
 
+if TYPE_CHECKING:
+    from ha_mqtt_publisher.config import MQTTSettings
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
@@ -36,7 +41,8 @@ class MQTTPublisher:
         tls: TLS configuration settings
         max_retries: Maximum connection attempts
         last_will: Last Will and Testament settings
-        config: Complete configuration dictionary (alternative to individual params)
+        config: Complete configuration dictionary or MQTTSettings (alternative to
+            individual params)
         protocol: MQTT protocol version ('MQTTv31', 'MQTTv311', 'MQTTv5')
         properties: MQTT 5.0 properties for connection
         default_qos: Default QoS level for publish operations (0-2)
@@ -114,8 +120,6 @@ class MQTTPublisher:
 
         # Log warnings but don't fail
         if warnings:
-            import logging
-
             for warning in warnings:
                 logging.warning(f"MQTT configuration warning: {warning}")
 
@@ -171,8 +175,6 @@ class MQTTPublisher:
             if "*" in pattern:
                 # Simple wildcard matching
                 pattern_regex = pattern.replace("*", ".*")
-                import re
-
                 if re.match(pattern_regex, topic):
                     return logger
 
@@ -189,14 +191,16 @@ class MQTTPublisher:
         tls: dict | None = None,
         max_retries: int = 3,
         last_will: dict | None = None,
-        config: dict | None = None,
+        config: dict | MQTTSettings | None = None,
         protocol: str = "MQTTv311",  # New: Support for MQTT protocol version
         properties: dict | None = None,  # New: MQTT 5.0 properties
         default_qos: int = 0,  # New: Default QoS for publish operations
         default_retain: bool = False,  # New: Default retain flag for publish operations
         logging_config: dict | None = None,  # New: Enhanced logging configuration
     ):
-        # Handle config dict parameter
+        # Handle config dict parameter (MQTTSettings converts to the same dict)
+        if hasattr(config, "as_dict"):
+            config = config.as_dict()
         if config:
             self.broker_url = config["broker_url"]
             self.broker_port = self._convert_port(config.get("broker_port"))
@@ -312,19 +316,27 @@ class MQTTPublisher:
             self.client.tls_insecure_set(not self.tls.get("verify", True))
 
         # Set up callbacks
-        # Wrap connect/disconnect/publish handlers to normalize v1/v2 signatures
+        # Wrap connect/disconnect/publish handlers to normalize v1/v2 signatures;
+        # with a known callback API version the wrappers forward args directly
+        api_version = getattr(self.client, "_callback_api_version", None)
         try:
-            self.client.on_connect = safe_on_connect(self._on_connect)
+            self.client.on_connect = safe_on_connect(
+                self._on_connect, api_version=api_version
+            )
         except Exception:
             self.client.on_connect = self._on_connect
         # Wrap disconnect/publish handlers to be tolerant of v1/v2 signatures from paho
         try:
-            self.client.on_disconnect = safe_on_disconnect(self._on_disconnect)
+            self.client.on_disconnect = safe_on_disconnect(
+                self._on_disconnect, api_version=api_version
+            )
         except Exception:
             self.client.on_disconnect = self._on_disconnect
 
         try:
-            self.client.on_publish = safe_on_publish(self._on_publish)
+            self.client.on_publish = safe_on_publish(
+                self._on_publish, api_version=api_version
+            )
         except Exception:
             self.client.on_publish = self._on_publish
 
@@ -552,8 +564,6 @@ class MQTTPublisher:
                 # Exponential backoff with jitter
                 delay = min(base_delay * (2 ** (retries - 1)), max_delay)
                 # Add some jitter (±25% of the delay)
-                import random
-
                 jitter = delay * 0.25 * (random.random() * 2 - 1)
                 actual_delay = max(0.5, delay + jitter)
 
@@ -589,7 +599,8 @@ class MQTTPublisher:
 
         Args:
             topic: The MQTT topic
-            payload: The message payload
+            payload: The message payload. dict/list payloads are JSON-encoded;
+                str, bytes and bytearray payloads are sent as-is.
             qos: Quality of service (0-2). If None, uses default_qos
             retain: Whether to retain the message. If None, uses default_retain
             properties: MQTT 5.0 properties (only used with MQTTv5)
@@ -695,6 +706,40 @@ class MQTTPublisher:
             logging.error(f"Error subscribing to topic: {e}")
             return False
 
+    def subscribe_many(self, topics: list[str], qos: int = 0, callback=None) -> bool:
+        """Subscribe to several topics with a single SUBSCRIBE packet.
+
+        Args:
+            topics: The MQTT topics to subscribe to
+            qos: Quality of service (0-2) applied to every topic
+            callback: Optional callback function registered for each topic
+
+        Returns:
+            bool: Success status
+        """
+        if not self._connected:
+            logging.error("Not connected to broker")
+            return False
+        if not topics:
+            return True
+
+        try:
+            if callback:
+                for topic in topics:
+                    self.client.message_callback_add(topic, callback)
+
+            result = self.client.subscribe([(topic, qos) for topic in topics])
+
+            if result[0] == mqtt.MQTT_ERR_SUCCESS:
+                logging.info(f"Subscribed to {len(topics)} topics")
+                return True
+            else:
+                logging.error(f"Failed to subscribe to topics: {result[0]}")
+                return False
+        except Exception as e:
+            logging.error(f"Error subscribing to topics: {e}")
+            return False
+
     def unsubscribe(self, topic: str, properties: dict | None = None) -> bool:
         """Unsubscribe from an MQTT topic.
 
@@ -737,6 +782,37 @@ class MQTTPublisher:
             logging.error(f"Error unsubscribing from topic: {e}")
             return False
 
+    def unsubscribe_many(self, topics: list[str]) -> bool:
+        """Unsubscribe from several topics with a single UNSUBSCRIBE packet.
+
+        Args:
+            topics: The MQTT topics to unsubscribe from
+
+        Returns:
+            bool: Success status
+        """
+        if not self._connected:
+            logging.error("Not connected to broker")
+            return False
+        if not topics:
+            return True
+
+        try:
+            for topic in topics:
+                self.client.message_callback_remove(topic)
+
+            result = self.client.unsubscribe(list(topics))
+
+            if result[0] == mqtt.MQTT_ERR_SUCCESS:
+                logging.info(f"Unsubscribed from {len(topics)} topics")
+                return True
+            else:
+                logging.error(f"Failed to unsubscribe from topics: {result[0]}")
+                return False
+        except Exception as e:
+            logging.error(f"Error unsubscribing from topics: {e}")
+            return False
+
     def set_message_callback(self, callback) -> None:
         """Set the default message callback for all subscribed topics.
 
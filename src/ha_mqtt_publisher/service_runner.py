@@ -58,17 +58,16 @@ def run_service_loop(
 
     - Optionally publishes availability online/offline
     - Supports graceful shutdown via signals (SIGINT/SIGTERM) or provided stop_event
+    - Signal handlers are only installed on the main thread (Python allows no
+      other); from a worker thread, stop the loop through stop_event instead
     """
 
-    local_event: threading.Event | None = None
-
     if stop_event is None:
-        local_event = threading.Event()
-        stop_event = local_event
+        stop_event = threading.Event()
 
     # Install signal handlers to trigger stop
-    cleanup: list[Callable[[], None]] = []
-    if install_signals:
+    previous_handlers = None
+    if install_signals and threading.current_thread() is threading.main_thread():
 
         def _stop_handler(signum, frame):  # pragma: no cover - tiny glue
             try:
@@ -76,39 +75,33 @@ def run_service_loop(
             except Exception:
                 pass
 
-        previous_int = signal.getsignal(signal.SIGINT)
-        previous_term = signal.getsignal(signal.SIGTERM)
+        previous_handlers = (
+            signal.getsignal(signal.SIGINT),
+            signal.getsignal(signal.SIGTERM),
+        )
         signal.signal(signal.SIGINT, _stop_handler)
         signal.signal(signal.SIGTERM, _stop_handler)
 
-        def _restore():
-            try:
-                signal.signal(signal.SIGINT, previous_int)
-                signal.signal(signal.SIGTERM, previous_term)
-            except Exception:
-                pass
-
-        cleanup.append(_restore)
-
     # Availability online
     if availability:
         availability.online()
 
     try:
-        # Main loop
+        # Main loop; monotonic time so wall-clock adjustments can't skew the sleep
         while not stop_event.is_set():
-            start = time.time()
+            start = time.monotonic()
             on_tick()
             # Sleep remaining time, if any
-            elapsed = time.time() - start
+            elapsed = time.monotonic() - start
             remaining = interval_s - elapsed
             if remaining > 0:
                 stop_event.wait(remaining)
     finally:
         if availability:
             availability.offline()
-        for fn in cleanup:
+        if previous_handlers is not None:
             try:
-                fn()
+                signal.signal(signal.SIGINT, previous_handlers[0])
+                signal.signal(signal.SIGTERM, previous_handlers[1])
             except Exception:
                 pass
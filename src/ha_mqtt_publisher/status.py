@@ -2,12 +2,12 @@
 
 from __future__ import annotations
 
-from dataclasses import asdict, dataclass, field
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any
 
 
-@dataclass
+@dataclass(slots=True)
 class StatusError:
     type: str
     message: str
@@ -15,7 +15,7 @@ class StatusError:
     extra: dict[str, Any] | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class StatusPayload:
     status: str
     event_count: int = 0
@@ -28,10 +28,26 @@ class StatusPayload:
     errors: list[StatusError] = field(default_factory=list)
 
     def as_dict(self) -> dict[str, Any]:
-        d = asdict(self)
-        # Convert nested dataclasses
-        d["errors"] = [asdict(e) for e in self.errors]
-        return d
+        # Built by hand: dataclasses.asdict() deep-copies every field recursively
+        return {
+            "status": self.status,
+            "event_count": self.event_count,
+            "last_run_ts": self.last_run_ts,
+            "last_run_iso": self.last_run_iso,
+            "ai_enabled": self.ai_enabled,
+            "ai_error_count": self.ai_error_count,
+            "publish_error_count": self.publish_error_count,
+            "error_count": self.error_count,
+            "errors": [
+                {
+                    "type": e.type,
+                    "message": e.message,
+                    "when": e.when,
+                    "extra": None if e.extra is None else dict(e.extra),
+                }
+                for e in self.errors
+            ],
+        }
 
     def mark_run(self) -> None:
         now = datetime.now(tz=timezone.utc)
@@ -48,4 +64,5 @@ class StatusPayload:
 
     def cap_errors(self, max_items: int = 20) -> None:
         if len(self.errors) > max_items:
-            self.errors = self.errors[-max_items:]
+            # Trim in place rather than allocating a new list
+            del self.errors[: len(self.errors) - max_items]
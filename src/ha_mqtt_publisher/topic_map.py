@@ -5,28 +5,23 @@ Provides a tiny helper to derive common MQTT topics used by apps.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 
-@dataclass(frozen=True)
+@dataclass(slots=True, frozen=True)
 class TopicMap:
     base: str
-
-    @property
-    def status(self) -> str:
-        return f"{self.base}/status"
-
-    @property
-    def availability(self) -> str:
-        return f"{self.base}/availability"
-
-    @property
-    def events(self) -> str:
-        return f"{self.base}/events"
-
-    @property
-    def commands(self) -> str:
-        return f"{self.base}/cmd"
+    # Derived topics, built once in __post_init__
+    status: str = field(init=False, repr=False, compare=False)
+    availability: str = field(init=False, repr=False, compare=False)
+    events: str = field(init=False, repr=False, compare=False)
+    commands: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "status", f"{self.base}/status")
+        object.__setattr__(self, "availability", f"{self.base}/availability")
+        object.__setattr__(self, "events", f"{self.base}/events")
+        object.__setattr__(self, "commands", f"{self.base}/cmd")
 
     def cmd(self, name: str) -> str:
         return f"{self.commands}/{name}"
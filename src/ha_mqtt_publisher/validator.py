@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from collections.abc import Callable
-import time
+import threading
 from typing import Any
 
 
@@ -21,33 +21,55 @@ def validate_retained(
     """
 
     seen: dict[str, Any] = {}
+    if not topics:
+        return seen
 
+    target = len(topics)
+    all_seen = threading.Event()
+
+    # Records payloads; wakes the wait below once every topic has arrived
     def _cb(_client, _userdata, msg):  # pragma: no cover - thin glue
         try:
             seen[msg.topic] = msg.payload
+            if len(seen) >= target:
+                all_seen.set()
             if on_message:
                 on_message(msg.topic, msg.payload)
         except Exception:
             pass
 
-    # Subscribe
-    for t in topics:
+    # Subscribe; clients with subscribe_many (MQTTPublisher) get one packet
+    subscribe_many = getattr(client, "subscribe_many", None)
+    if subscribe_many is not None:
         try:
-            client.subscribe(t, qos=0, callback=_cb)
+            subscribe_many(topics, qos=0, callback=_cb)
         except Exception:
             # Best-effort
             pass
+    else:
+        for t in topics:
+            try:
+                client.subscribe(t, qos=0, callback=_cb)
+            except Exception:
+                # Best-effort
+                pass
 
-    deadline = time.time() + max(0.05, float(timeout_s))
-    while time.time() < deadline and len(seen) < len(topics):
-        time.sleep(0.05)
+    # Wait until all are seen or the timeout expires
+    all_seen.wait(max(0.05, float(timeout_s)))
 
     # Unsubscribe
-    for t in topics:
+    unsubscribe_many = getattr(client, "unsubscribe_many", None)
+    if unsubscribe_many is not None:
         try:
-            if hasattr(client, "unsubscribe"):
-                client.unsubscribe(t)
+            unsubscribe_many(topics)
         except Exception:
             pass
+    else:
+        for t in topics:
+            try:
+                if hasattr(client, "unsubscribe"):
+                    client.unsubscribe(t)
+            except Exception:
+                pass
 
     return seen
@@ -83,3 +83,55 @@ def test_get_device_info(mock_config):
     }
 
     assert device_info == expected_info
+
+
+def test_get_device_info_includes_every_set_field_in_order(default_config):
+    """All optional fields that are set appear after identifiers and name."""
+    from ha_mqtt_publisher.ha_discovery.device import Device
+
+    optional = [
+        "manufacturer",
+        "model",
+        "sw_version",
+        "hw_version",
+        "configuration_url",
+        "connections",
+        "suggested_area",
+        "via_device",
+        "model_id",
+        "serial_number",
+    ]
+    device = Device(
+        default_config, identifiers=["d1"], name="D", **{f: f for f in optional}
+    )
+
+    info = device.get_device_info()
+
+    assert list(info) == ["identifiers", "name", *optional]
+    assert all(info[f] == f for f in optional)
+
+
+def test_device_only_reads_config_for_fields_not_passed():
+    """Explicit kwargs skip the config lookup for that field."""
+    from unittest.mock import MagicMock
+
+    from ha_mqtt_publisher.ha_discovery.device import Device
+
+    config = MagicMock()
+    config.get.side_effect = lambda key, default=None: default
+
+    device = Device(config, identifiers=["d1"], name="D", model="M")
+
+    looked_up = {call.args[0] for call in config.get.call_args_list}
+    assert not looked_up & {"app.unique_id_prefix", "app.name", "app.model"}
+    assert "app.manufacturer" in looked_up
+    assert (device.identifiers, device.name, device.model) == (["d1"], "D", "M")
+    assert device.manufacturer == "Generic MQTT Publisher"
+
+
+def test_device_has_no_instance_dict(default_config):
+    """Device is slotted."""
+    from ha_mqtt_publisher.ha_discovery.device import Device
+
+    device = Device(default_config)
+    assert not hasattr(device, "__dict__")
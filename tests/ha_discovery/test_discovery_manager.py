@@ -1,7 +1,9 @@
 """Test the DiscoveryManager class."""
 
 import json
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
+
+import pytest
 
 from ha_mqtt_publisher.ha_discovery.device import Device
 from ha_mqtt_publisher.ha_discovery.discovery_manager import DiscoveryManager
@@ -45,6 +47,12 @@ class TestDiscoveryManager:
         assert self.manager.devices == {}
         assert self.manager.discovery_prefix == "homeassistant"
 
+    def test_manager_is_slotted(self):
+        """Test DiscoveryManager keeps its state in slots, not a __dict__."""
+        assert not hasattr(self.manager, "__dict__")
+        with pytest.raises(AttributeError):
+            self.manager.unexpected = True
+
     def test_initialization_with_custom_prefix(self):
         """Test DiscoveryManager with custom discovery prefix."""
         config = MockConfig({"home_assistant": {"discovery_prefix": "custom_prefix"}})
@@ -81,7 +89,7 @@ class TestDiscoveryManager:
         # Verify publish was called correctly
         self.publisher.publish.assert_called_once_with(
             topic="homeassistant/sensor/test_entity_123/config",
-            payload=json.dumps({"name": "Test Entity"}),
+            payload=b'{"name":"Test Entity"}',
             retain=True,
         )
 
@@ -305,6 +313,51 @@ class TestDiscoveryManager:
         assert entity2 in entities
         assert other_entity not in entities
 
+    def test_device_index_follows_entity_writes(self):
+        """Test the device index stays in sync with every entities write path."""
+        device_a = Mock(spec=Device)
+        device_b = Mock(spec=Device)
+        self.manager.devices["a"] = device_a
+        self.manager.devices["b"] = device_b
+
+        def make_entity(uid, device):
+            entity = Mock(spec=Entity)
+            entity.unique_id = uid
+            entity.device = device
+            return entity
+
+        e1, e2, e3 = (make_entity(f"e{i}", device_a) for i in (1, 2, 3))
+        self.manager.entities["e1"] = e1
+        self.manager.entities.update(e2=e2, e3=e3)
+        assert self.manager.get_device_entities("a") == [e1, e2, e3]
+
+        del self.manager.entities["e2"]
+        self.manager.entities.pop("e3")
+        self.manager.entities["e1"] = make_entity("e1", device_b)
+        assert self.manager.get_device_entities("a") == []
+        assert [e.unique_id for e in self.manager.get_device_entities("b")] == ["e1"]
+
+        # Swapping the device without re-storing the entity is still reported
+        self.manager.entities["e1"].device = device_a
+        assert self.manager.get_device_entities("b") == []
+        assert [e.unique_id for e in self.manager.get_device_entities("a")] == ["e1"]
+        self.manager.entities["e1"].device = device_b
+        assert [e.unique_id for e in self.manager.get_device_entities("b")] == ["e1"]
+
+        # Moving an entity onto a device with indexed entities needs reindex()
+        e4 = make_entity("e4", device_a)
+        self.manager.entities["e4"] = e4
+        e4.device = device_b
+        self.manager.entities.reindex()
+        assert [e.unique_id for e in self.manager.get_device_entities("b")] == [
+            "e1",
+            "e4",
+        ]
+        assert self.manager.entities.device_uids(device_a) == []
+
+        self.manager.entities.clear()
+        assert self.manager.get_device_entities("a") == []
+
     def test_get_device_entities_not_found(self):
         """Test getting entities for non-existent device."""
         entities = self.manager.get_device_entities("non_existent")
@@ -339,6 +392,148 @@ class TestDiscoveryManager:
         assert result is True
         assert self.publisher.publish.call_count == 2
 
+    def test_publish_batch_serializes_first_and_isolates_failures(self):
+        """Test publish_batch encodes every entity before publishing any."""
+        events = []
+
+        def make_entity(uid, fail=False):
+            entity = Mock(spec=Entity)
+            entity.unique_id = uid
+            entity.name = uid
+            entity.get_config_topic.return_value = f"homeassistant/sensor/{uid}/config"
+            if fail:
+                entity.get_config_payload.side_effect = Exception("bad payload")
+            else:
+                entity.get_config_payload.side_effect = lambda: (
+                    events.append(("encode", uid)) or {"name": uid}
+                )
+            return entity
+
+        def publish(topic, payload, retain):
+            events.append(("publish", json.loads(payload)["name"]))
+            return True
+
+        self.publisher.publish.side_effect = publish
+        entities = [
+            make_entity("a"),
+            make_entity("broken", fail=True),
+            make_entity("b"),
+        ]
+
+        result = self.manager.publish_batch(entities)
+
+        assert result is False
+        assert events == [
+            ("encode", "a"),
+            ("encode", "b"),
+            ("publish", "a"),
+            ("publish", "b"),
+        ]
+        assert set(self.manager.entities) == {"a", "broken", "b"}
+
+    def test_discovery_json_cached_until_entity_version_changes(self):
+        """Test encoded discovery JSON is reused until the entity is invalidated."""
+        device = Device(self.config, identifiers=["dev1"], name="Dev")
+        entity = Entity(self.config, device, name="Temp", unique_id="temp")
+        self.publisher.publish.return_value = True
+
+        with patch.object(
+            entity, "get_config_payload", wraps=entity.get_config_payload
+        ) as build:
+            self.manager.add_entity(entity)
+            self.manager.publish_all_discoveries()
+        assert build.call_count == 1
+        first, second = (
+            c.kwargs["payload"] for c in self.publisher.publish.call_args_list
+        )
+        assert second is first
+        assert json.loads(first)["name"] == "Temp"
+
+        self.manager.update_entity("temp", name="Temperature")
+        assert (
+            json.loads(self.publisher.publish.call_args.kwargs["payload"])["name"]
+            == "Temperature"
+        )
+
+        # In-place edits are picked up once the entity is invalidated
+        device.identifiers.append("dev2")
+        self.manager.add_entity(entity)
+        payload = json.loads(self.publisher.publish.call_args.kwargs["payload"])
+        assert payload["device"]["identifiers"] == ["dev1"]
+        entity.invalidate_discovery()
+        self.manager.add_entity(entity)
+        payload = json.loads(self.publisher.publish.call_args.kwargs["payload"])
+        assert payload["device"]["identifiers"] == ["dev1", "dev2"]
+
+        # Values that compare equal across types still produce new JSON
+        self.manager.update_entity("temp", precision=1)
+        self.publisher.publish.reset_mock()
+        self.manager.update_entity("temp", precision=1.0)
+        self.publisher.publish.assert_called_once()
+        payload = json.loads(self.publisher.publish.call_args.kwargs["payload"])
+        assert isinstance(payload["precision"], float)
+
+    def test_async_variants_run_off_the_event_loop(self):
+        """Test the async wrappers publish from a worker thread."""
+        import asyncio
+        import threading
+
+        entity = Mock(spec=Entity)
+        entity.unique_id = "entity1"
+        entity.name = "Entity 1"
+        entity.get_config_topic.return_value = "homeassistant/sensor/entity1/config"
+        entity.get_config_payload.return_value = {"name": "Entity 1"}
+        self.manager.entities["entity1"] = entity
+
+        threads = []
+
+        def publish(**kwargs):
+            threads.append(threading.current_thread())
+            return True
+
+        self.publisher.publish.side_effect = publish
+
+        async def run():
+            published = await self.manager.publish_all_discoveries_async()
+            cleared = await self.manager.clear_all_discoveries_async()
+            return published, cleared
+
+        assert asyncio.run(run()) == (True, True)
+        assert len(threads) == 2
+        assert threading.main_thread() not in threads
+        assert self.manager.entities == {}
+
+    def test_update_entity_skips_unchanged_discovery(self):
+        """Test update_entity only republishes when discovery output changes."""
+        device = Device(self.config, identifiers=["dev1"], name="Dev")
+        entity = Entity(self.config, device, name="Temp", unique_id="temp")
+        self.publisher.publish.return_value = True
+        assert self.manager.add_entity(entity) is True
+
+        # base_topic is not part of the discovery payload
+        assert self.manager.update_entity("temp", base_topic="other") is True
+        assert self.manager.update_entity("temp", name="Temp") is True
+        assert self.publisher.publish.call_count == 1
+
+        # A failed publish is retried by the next update
+        self.publisher.publish.return_value = False
+        assert self.manager.update_entity("temp", icon="mdi:thermometer") is False
+        self.publisher.publish.return_value = True
+        assert self.manager.update_entity("temp", icon="mdi:thermometer") is True
+        assert self.publisher.publish.call_count == 3
+
+        # After removal the same payload is published again
+        self.manager.remove_entity("temp")
+        assert self.manager.add_entity(entity) is True
+        assert self.publisher.publish.call_count == 5
+
+        # A value that only changes type (1 -> True) is still a change
+        assert self.manager.update_entity("temp", retain=1) is True
+        assert self.manager.update_entity("temp", retain=True) is True
+        assert self.publisher.publish.call_count == 7
+        payload = json.loads(self.publisher.publish.call_args.kwargs["payload"])
+        assert payload["retain"] is True
+
     def test_clear_all_discoveries(self):
         """Test clearing all discovery configurations."""
         # Create mock entities
@@ -449,6 +644,25 @@ class TestDiscoveryManager:
         assert devices[0]["name"] == "Test Device"
         assert devices[0]["entity_count"] == 0
 
+    def test_list_devices_counts_entities_per_device(self):
+        """Test entity_count reflects only the device's own entities."""
+        device_a = Mock(spec=Device)
+        device_a.name = "A"
+        device_b = Mock(spec=Device)
+        device_b.name = "B"
+        self.manager.devices.update(a=device_a, b=device_b)
+        for uid, device in (("1", device_a), ("2", device_a), ("3", device_b)):
+            entity = Mock(spec=Entity)
+            entity.unique_id = uid
+            entity.device = device
+            self.manager.entities[uid] = entity
+
+        counts = {
+            d["device_id"]: d["entity_count"] for d in self.manager.list_devices()
+        }
+
+        assert counts == {"a": 2, "b": 1}
+
     def test_add_entity_publish_failure_with_logging(self):
         """Test adding entity with publish failure and verify logging."""
         from unittest.mock import patch
@@ -465,7 +679,9 @@ class TestDiscoveryManager:
         # Mock failed publish
         self.publisher.publish.return_value = False
 
-        with patch("logging.error") as mock_error:
+        with patch(
+            "ha_mqtt_publisher.ha_discovery.discovery_manager.logger.error"
+        ) as mock_error:
             # Test adding entity
             result = self.manager.add_entity(entity)
 
@@ -492,7 +708,9 @@ class TestDiscoveryManager:
         # Mock successful publish
         self.publisher.publish.return_value = True
 
-        with patch("logging.info") as mock_info:
+        with patch(
+            "ha_mqtt_publisher.ha_discovery.discovery_manager.logger.info"
+        ) as mock_info:
             # Test adding entity
             result = self.manager.add_entity(entity)
 
@@ -507,15 +725,16 @@ class TestDiscoveryManager:
         """Test removing non-existent entity and verify warning logging."""
         from unittest.mock import patch
 
-        with patch("logging.warning") as mock_warning:
+        with patch(
+            "ha_mqtt_publisher.ha_discovery.discovery_manager.logger.warning"
+        ) as mock_warning:
             # Test removing non-existent entity
             result = self.manager.remove_entity("non_existent_entity")
 
             # Verify warning was logged
             mock_warning.assert_called_once()
-            assert (
-                "Entity 'non_existent_entity' not found" in mock_warning.call_args[0][0]
-            )
+            message, *args = mock_warning.call_args[0]
+            assert "Entity 'non_existent_entity' not found" in message % tuple(args)
 
         # Verify results
         assert result is False
@@ -537,7 +756,9 @@ class TestDiscoveryManager:
         # Mock successful publish
         self.publisher.publish.return_value = True
 
-        with patch("logging.info") as mock_info:
+        with patch(
+            "ha_mqtt_publisher.ha_discovery.discovery_manager.logger.info"
+        ) as mock_info:
             # Test removing entity
             result = self.manager.remove_entity("test_entity_remove_log")
 
@@ -565,7 +786,9 @@ class TestDiscoveryManager:
         # Mock failed publish
         self.publisher.publish.return_value = False
 
-        with patch("logging.error") as mock_error:
+        with patch(
+            "ha_mqtt_publisher.ha_discovery.discovery_manager.logger.error"
+        ) as mock_error:
             # Test removing entity
             result = self.manager.remove_entity("test_entity_remove_fail")
 
@@ -585,7 +808,9 @@ class TestDiscoveryManager:
         entity.unique_id = "test_entity_exception"
         entity.get_config_topic.side_effect = Exception("Test exception")
 
-        with patch("logging.error") as mock_error:
+        with patch(
+            "ha_mqtt_publisher.ha_discovery.discovery_manager.logger.error"
+        ) as mock_error:
             # Test adding entity
             result = self.manager.add_entity(entity)
 
@@ -608,7 +833,9 @@ class TestDiscoveryManager:
 
         self.manager.entities["test_entity_exception_remove"] = entity
 
-        with patch("logging.error") as mock_error:
+        with patch(
+            "ha_mqtt_publisher.ha_discovery.discovery_manager.logger.error"
+        ) as mock_error:
             # Test removing entity
             result = self.manager.remove_entity("test_entity_exception_remove")
 
@@ -663,7 +890,9 @@ class TestDiscoveryManager:
         # Make name property raise an exception when accessed
         type(device).name = PropertyMock(side_effect=Exception("Test exception"))
 
-        with patch("logging.error") as mock_error:
+        with patch(
+            "ha_mqtt_publisher.ha_discovery.discovery_manager.logger.error"
+        ) as mock_error:
             # Test adding device
             result = self.manager.add_device(device)
 
@@ -683,7 +912,9 @@ class TestDiscoveryManager:
         device.name = "Test Device Success"
         device.identifiers = ["test_device_success"]
 
-        with patch("logging.info") as mock_info:
+        with patch(
+            "ha_mqtt_publisher.ha_discovery.discovery_manager.logger.info"
+        ) as mock_info:
             # Test adding device
             result = self.manager.add_device(device)
 
@@ -698,15 +929,16 @@ class TestDiscoveryManager:
         """Test removing non-existent device and verify warning logging."""
         from unittest.mock import patch
 
-        with patch("logging.warning") as mock_warning:
+        with patch(
+            "ha_mqtt_publisher.ha_discovery.discovery_manager.logger.warning"
+        ) as mock_warning:
             # Test removing non-existent device
             result = self.manager.remove_device("non_existent_device")
 
             # Verify warning was logged
             mock_warning.assert_called_once()
-            assert (
-                "Device 'non_existent_device' not found" in mock_warning.call_args[0][0]
-            )
+            message, *args = mock_warning.call_args[0]
+            assert "Device 'non_existent_device' not found" in message % tuple(args)
 
         # Verify results
         assert result is False
@@ -726,7 +958,9 @@ class TestDiscoveryManager:
         # Mock successful entity removal
         self.publisher.publish.return_value = True
 
-        with patch("logging.info") as mock_info:
+        with patch(
+            "ha_mqtt_publisher.ha_discovery.discovery_manager.logger.info"
+        ) as mock_info:
             # Test removing device
             result = self.manager.remove_device("test_device_remove_log")
 
@@ -748,7 +982,9 @@ class TestDiscoveryManager:
 
         self.manager.devices["test_device_exception"] = device
 
-        with patch("logging.error") as mock_error:
+        with patch(
+            "ha_mqtt_publisher.ha_discovery.discovery_manager.logger.error"
+        ) as mock_error:
             # Test removing device
             result = self.manager.remove_device("test_device_exception")
 
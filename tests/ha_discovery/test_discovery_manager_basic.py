@@ -1,6 +1,6 @@
 """Test the DiscoveryManager class."""
 
-from unittest.mock import Mock
+from unittest.mock import Mock, PropertyMock
 
 from ha_mqtt_publisher.ha_discovery.device import Device
 from ha_mqtt_publisher.ha_discovery.discovery_manager import DiscoveryManager
@@ -210,7 +210,7 @@ class TestDiscoveryManagerBasic:
         self.publisher.publish.return_value = False
 
         with patch(
-            "ha_mqtt_publisher.ha_discovery.discovery_manager.logging.error"
+            "ha_mqtt_publisher.ha_discovery.discovery_manager.logger.error"
         ) as mock_error:
             # Test adding entity
             result = self.manager.add_entity(entity)
@@ -238,7 +238,7 @@ class TestDiscoveryManagerBasic:
         self.publisher.publish.return_value = True
 
         with patch(
-            "ha_mqtt_publisher.ha_discovery.discovery_manager.logging.info"
+            "ha_mqtt_publisher.ha_discovery.discovery_manager.logger.info"
         ) as mock_info:
             # Test adding entity
             result = self.manager.add_entity(entity)
@@ -254,7 +254,7 @@ class TestDiscoveryManagerBasic:
         from unittest.mock import patch
 
         with patch(
-            "ha_mqtt_publisher.ha_discovery.discovery_manager.logging.warning"
+            "ha_mqtt_publisher.ha_discovery.discovery_manager.logger.warning"
         ) as mock_warning:
             # Test removing non-existent entity
             result = self.manager.remove_entity("non_existent_entity")
@@ -283,7 +283,7 @@ class TestDiscoveryManagerBasic:
         self.publisher.publish.return_value = True
 
         with patch(
-            "ha_mqtt_publisher.ha_discovery.discovery_manager.logging.info"
+            "ha_mqtt_publisher.ha_discovery.discovery_manager.logger.info"
         ) as mock_info:
             # Test removing entity
             result = self.manager.remove_entity("test_entity_remove_log")
@@ -312,7 +312,7 @@ class TestDiscoveryManagerBasic:
         self.publisher.publish.return_value = False
 
         with patch(
-            "ha_mqtt_publisher.ha_discovery.discovery_manager.logging.error"
+            "ha_mqtt_publisher.ha_discovery.discovery_manager.logger.error"
         ) as mock_error:
             # Test removing entity
             result = self.manager.remove_entity("test_entity_remove_fail")
@@ -333,7 +333,7 @@ class TestDiscoveryManagerBasic:
         entity.get_config_topic.side_effect = Exception("Test exception")
 
         with patch(
-            "ha_mqtt_publisher.ha_discovery.discovery_manager.logging.error"
+            "ha_mqtt_publisher.ha_discovery.discovery_manager.logger.error"
         ) as mock_error:
             # Test adding entity
             result = self.manager.add_entity(entity)
@@ -357,7 +357,7 @@ class TestDiscoveryManagerBasic:
         self.manager.entities["test_entity_exception_remove"] = entity
 
         with patch(
-            "ha_mqtt_publisher.ha_discovery.discovery_manager.logging.error"
+            "ha_mqtt_publisher.ha_discovery.discovery_manager.logger.error"
         ) as mock_error:
             # Test removing entity
             result = self.manager.remove_entity("test_entity_exception_remove")
@@ -409,13 +409,11 @@ class TestDiscoveryManagerBasic:
 
         # Create mock device that will cause exception during access
         device = Mock(spec=Device)
-        # Use a property that exists but raise exception when accessing identifiers
-        device.identifiers = []
-        device.name = Mock()
-        device.name.__str__ = Mock(side_effect=Exception("Test exception"))
+        # Raise when add_device reads the identifiers
+        type(device).identifiers = PropertyMock(side_effect=Exception("Test exception"))
 
         with patch(
-            "ha_mqtt_publisher.ha_discovery.discovery_manager.logging.error"
+            "ha_mqtt_publisher.ha_discovery.discovery_manager.logger.error"
         ) as mock_error:
             # Test adding device
             result = self.manager.add_device(device)
@@ -436,7 +434,7 @@ class TestDiscoveryManagerBasic:
         device.identifiers = ["test_device_success"]
 
         with patch(
-            "ha_mqtt_publisher.ha_discovery.discovery_manager.logging.info"
+            "ha_mqtt_publisher.ha_discovery.discovery_manager.logger.info"
         ) as mock_info:
             # Test adding device
             result = self.manager.add_device(device)
@@ -452,7 +450,7 @@ class TestDiscoveryManagerBasic:
         from unittest.mock import patch
 
         with patch(
-            "ha_mqtt_publisher.ha_discovery.discovery_manager.logging.warning"
+            "ha_mqtt_publisher.ha_discovery.discovery_manager.logger.warning"
         ) as mock_warning:
             # Test removing non-existent device
             result = self.manager.remove_device("non_existent_device")
@@ -479,7 +477,7 @@ class TestDiscoveryManagerBasic:
         self.publisher.publish.return_value = True
 
         with patch(
-            "ha_mqtt_publisher.ha_discovery.discovery_manager.logging.info"
+            "ha_mqtt_publisher.ha_discovery.discovery_manager.logger.info"
         ) as mock_info:
             # Test removing device
             result = self.manager.remove_device("test_device_remove_log")
@@ -503,12 +501,12 @@ class TestDiscoveryManagerBasic:
 
         with (
             patch(
-                "ha_mqtt_publisher.ha_discovery.discovery_manager.logging.error"
+                "ha_mqtt_publisher.ha_discovery.discovery_manager.logger.error"
             ) as mock_error,
             patch.object(self.manager, "entities") as mock_entities,
         ):
-            # Make entities.items() raise an exception to trigger error path
-            mock_entities.items.side_effect = Exception(
+            # Make the device lookup raise an exception to trigger error path
+            mock_entities.device_uids.side_effect = Exception(
                 "Test exception during entity removal"
             )
 
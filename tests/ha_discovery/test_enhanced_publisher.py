@@ -6,6 +6,7 @@ from ha_mqtt_publisher.ha_discovery import (
     Device,
     Sensor,
     create_command_entities,
+    create_standard_buttons,
     publish_device_level_discovery,
 )
 
@@ -83,7 +84,96 @@ def test_publish_with_entity_objects():
     assert payload["cmps"]["test_status"]["p"] == "sensor"
 
 
+def test_device_info_built_once_for_origin_and_dev_block():
+    config = StubConfig(
+        {"app.unique_id_prefix": "app", "app.sw_version": "1.2", "mqtt.default_qos": 1}
+    )
+    publisher = PublisherMock()
+    calls = []
+
+    class CountingDevice(Device):
+        __slots__ = ()
+
+        def get_device_info(self):
+            calls.append(1)
+            return super().get_device_info()
+
+    device = CountingDevice(
+        config,
+        identifiers=["dev1"],
+        name="Dev",
+        configuration_url="http://dev.local",
+    )
+
+    publish_device_level_discovery(config, publisher, device, [])
+
+    payload = json.loads(publisher.calls[0][1])
+    assert len(calls) == 1
+    assert payload["o"] == {"name": "app", "sw": "1.2", "url": "http://dev.local"}
+    assert payload["dev"]["identifiers"] == ["dev1"]
+    assert payload["qos"] == 1
+
+
+def test_component_keys_drop_only_the_leading_app_prefix():
+    config = StubConfig({"app.unique_id_prefix": "app"})
+    publisher = PublisherMock()
+    device = Device(config, identifiers=["dev1"], name="Dev")
+    entities = [
+        Sensor(config, device, name="T", unique_id="temp", state_topic="s/t"),
+        Sensor(config, device, name="A", unique_id="x_app_y", state_topic="s/a"),
+    ]
+
+    publish_device_level_discovery(config, publisher, device, entities)
+
+    payload = json.loads(publisher.calls[0][1])
+    assert sorted(payload["cmps"]) == ["temp", "x_app_y"]
+
+
+def test_migration_publishes_one_marker_per_component():
+    config = StubConfig({"app.unique_id_prefix": "app"})
+    publisher = PublisherMock()
+    device = Device(config, identifiers=["dev1"], name="Dev")
+    entities = [
+        Sensor(config, device, name=n, unique_id=n, state_topic=f"s/{n}")
+        for n in ("a", "b", "c")
+    ]
+
+    publish_device_level_discovery(
+        config, publisher, device, entities, migrate_from_per_entity=True
+    )
+
+    topics = [call[0] for call in publisher.calls]
+    assert topics[0] == "homeassistant/sensor/dev1/migrate_discovery"
+    assert topics[1] == "homeassistant/device/dev1/config"
+    assert topics[2:] == [e.get_config_topic() for e in entities]
+    assert json.loads(publisher.calls[0][1]) == {"migrated_to": topics[1]}
+
+
+def test_create_standard_buttons_defaults_and_icons():
+    config = StubConfig()
+    device = Device(config, identifiers=["dev1"], name="Dev")
+
+    buttons = create_standard_buttons(config, device, "app", "app/cmd")
+    custom = create_standard_buttons(config, device, "app", "app/cmd", ["reset", "x"])
+
+    assert [b.command_topic for b in buttons] == [
+        "app/cmd/refresh",
+        "app/cmd/clear_cache",
+        "app/cmd/restart",
+    ]
+    assert [b.icon for b in buttons] == [
+        "mdi:refresh",
+        "mdi:delete-sweep",
+        "mdi:restart",
+    ]
+    assert [b.icon for b in custom] == ["mdi:backup-restore", "mdi:gesture-tap-button"]
+
+
 if __name__ == "__main__":
     test_create_command_entities()
     test_publish_with_entity_objects()
+    test_device_info_built_once_for_origin_and_dev_block()
+    test_component_keys_drop_only_the_leading_app_prefix()
+    test_migration_publishes_one_marker_per_component()
+    test_create_standard_buttons_defaults_and_icons()
     print("✅ All tests passed!")
@@ -94,3 +94,65 @@ def test_ensure_discovery_bundle_only_republishes_bundle():
     # Should republish a single bundle topic
     assert any(call[0] == "homeassistant/device/dev01/config" for call in pub.publishes)
     assert "homeassistant/device/dev01/config" in summary["republished"]
+
+
+def test_ensure_discovery_resolves_each_entity_topic_once(tmp_path):
+    cfg = StubConfig(
+        {
+            "home_assistant.discovery_prefix": "homeassistant",
+            "home_assistant.discovery_state_file": str(tmp_path / "state.json"),
+        }
+    )
+    device = Device(cfg, identifiers=["dev01"], name="Demo")
+    calls = []
+
+    class CountingSensor(Sensor):
+        def get_config_topic(self):
+            calls.append(self.unique_id)
+            return super().get_config_topic()
+
+    sensors = [
+        CountingSensor(cfg, device, name=n, unique_id=n, state_topic=f"x/{n}")
+        for n in ("a", "b")
+    ]
+    pub = PubMock(present={"homeassistant/sensor/a/config"})
+
+    summary = ensure_discovery(
+        config=cfg, publisher=pub, entities=sensors, timeout=0.05
+    )
+
+    assert calls == ["a", "b"]
+    assert summary["republished"] == {"homeassistant/sensor/b/config"}
+
+
+def test_ensure_discovery_returns_as_soon_as_all_topics_arrive(tmp_path):
+    import threading
+    import time
+
+    cfg = StubConfig(
+        {
+            "home_assistant.discovery_prefix": "homeassistant",
+            "home_assistant.discovery_state_file": str(tmp_path / "state.json"),
+        }
+    )
+    device = Device(cfg, identifiers=["dev01"], name="Demo")
+    sensors = [
+        Sensor(cfg, device, name=n, unique_id=n, state_topic=f"x/{n}")
+        for n in ("a", "b")
+    ]
+
+    class LatePub(PubMock):
+        """Delivers retained configs from another thread, like paho's loop."""
+
+        def subscribe(self, topic, qos=0, callback=None, properties=None):
+            self.subs.append((topic, qos))
+            threading.Timer(0.02, callback, (None, None, Msg(topic))).start()
+            return True
+
+    pub = LatePub()
+    started = time.monotonic()
+    summary = ensure_discovery(config=cfg, publisher=pub, entities=sensors, timeout=5)
+
+    assert time.monotonic() - started < 1
+    assert summary["missing"] == set()
+    assert pub.publishes == []
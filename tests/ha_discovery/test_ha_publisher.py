@@ -1,6 +1,5 @@
 """Test the ha_discovery publisher module."""
 
-import json
 from unittest.mock import Mock
 
 from ha_mqtt_publisher.ha_discovery.device import Device
@@ -116,12 +115,12 @@ class TestHADiscoveryPublisher:
 
         # First entity
         assert calls[0][1]["topic"] == "homeassistant/sensor/entity1/config"
-        assert calls[0][1]["payload"] == json.dumps({"name": "Entity 1"})
+        assert calls[0][1]["payload"] == b'{"name":"Entity 1"}'
         assert calls[0][1]["retain"] is True
 
         # Second entity
         assert calls[1][1]["topic"] == "homeassistant/sensor/entity2/config"
-        assert calls[1][1]["payload"] == json.dumps({"name": "Entity 2"})
+        assert calls[1][1]["payload"] == b'{"name":"Entity 2"}'
         assert calls[1][1]["retain"] is True
 
     def test_publish_discovery_configs_custom_device(self):
@@ -141,6 +140,28 @@ class TestHADiscoveryPublisher:
         # Should publish discovery config
         self.publisher.publish.assert_called_once()
 
+    def test_publish_discovery_configs_bundle_only_argument_overrides_config(self):
+        """bundle_only= takes precedence over home_assistant.bundle_only_mode."""
+        device = Device(self.config, identifiers=["dev1"], name="Dev")
+        sensors = [
+            Sensor(self.config, device, name=n, unique_id=n, state_topic=f"s/{n}")
+            for n in ("a", "b")
+        ]
+
+        publish_discovery_configs(
+            self.config, self.publisher, sensors, device, bundle_only=True
+        )
+        topics = [c[1]["topic"] for c in self.publisher.publish.call_args_list]
+        assert topics == ["homeassistant/device/dev1/config"]
+
+        self.publisher.reset_mock()
+        self.config.data["home_assistant"]["bundle_only_mode"] = True
+        publish_discovery_configs(
+            self.config, self.publisher, sensors, device, bundle_only=False
+        )
+        topics = [c[1]["topic"] for c in self.publisher.publish.call_args_list]
+        assert topics == [s.get_config_topic() for s in sensors]
+
     def test_create_sensor(self):
         """Test create_sensor function."""
         device = Mock(spec=Device)
@@ -5,12 +5,16 @@ import os
 import tempfile
 from unittest.mock import Mock, patch
 
+import pytest
+
 from ha_mqtt_publisher.ha_discovery.publisher import (
     clear_discovery_state,
     force_republish_discovery,
     publish_discovery_configs,
 )
 
+_MODULE = "ha_mqtt_publisher.ha_discovery.publisher"
+
 
 class TestOneTimeDiscoveryMode:
     """Test one-time discovery publication functionality."""
@@ -45,7 +49,7 @@ class TestOneTimeDiscoveryMode:
         mock_entity.get_config_topic.return_value = "homeassistant/sensor/test/config"
         mock_entity.get_config_payload.return_value = {"name": "Test Sensor"}
 
-        with patch("builtins.print"):
+        with patch(f"{_MODULE}.logger"):
             publish_discovery_configs(
                 config=mock_config,
                 publisher=mock_publisher,
@@ -91,7 +95,7 @@ class TestOneTimeDiscoveryMode:
         mock_entity.get_config_topic.return_value = "homeassistant/sensor/test/config"
         mock_entity.get_config_payload.return_value = {"name": "Test Sensor"}
 
-        with patch("builtins.print") as mock_print:
+        with patch(f"{_MODULE}.logger") as mock_logger:
             publish_discovery_configs(
                 config=mock_config,
                 publisher=mock_publisher,
@@ -101,10 +105,13 @@ class TestOneTimeDiscoveryMode:
 
         # Should NOT publish the config
         mock_publisher.publish.assert_not_called()
+        # ...nor build its payload
+        mock_entity.get_config_payload.assert_not_called()
 
-        # Should print skip message
-        mock_print.assert_any_call(
-            "Skipping already published discovery config: homeassistant/sensor/test/config"
+        # Should log skip message
+        mock_logger.info.assert_any_call(
+            "Skipping already published discovery config: %s",
+            "homeassistant/sensor/test/config",
         )
 
     def test_mixed_published_and_new_discovery(self):
@@ -137,7 +144,7 @@ class TestOneTimeDiscoveryMode:
         mock_entity2.get_config_topic.return_value = "homeassistant/sensor/test2/config"
         mock_entity2.get_config_payload.return_value = {"name": "Test Sensor 2"}
 
-        with patch("builtins.print"):
+        with patch(f"{_MODULE}.logger"):
             publish_discovery_configs(
                 config=mock_config,
                 publisher=mock_publisher,
@@ -156,6 +163,147 @@ class TestOneTimeDiscoveryMode:
         assert "homeassistant/sensor/test1/config" in final_state["published_topics"]
         assert "homeassistant/sensor/test2/config" in final_state["published_topics"]
 
+    def test_state_file_written_once_per_publish_cycle(self):
+        """Marks are batched in memory and flushed with one atomic write."""
+        mock_config = Mock()
+        mock_config.get.side_effect = lambda key, default=None: {
+            "home_assistant.enabled": True,
+            "home_assistant.discovery_state_file": self.state_file,
+        }.get(key, default)
+        entities = []
+        for i in range(5):
+            entity = Mock()
+            entity.get_config_topic.return_value = f"homeassistant/sensor/t{i}/config"
+            entity.get_config_payload.return_value = {"name": f"T{i}"}
+            entities.append(entity)
+
+        with (
+            patch(f"{_MODULE}.logger"),
+            patch(
+                "ha_mqtt_publisher.ha_discovery.publisher.os.replace",
+                wraps=os.replace,
+            ) as mock_replace,
+            patch(f"{_MODULE}.os.fsync", wraps=os.fsync) as mock_fsync,
+        ):
+            publish_discovery_configs(
+                config=mock_config,
+                publisher=Mock(),
+                entities=entities,
+                one_time_mode=True,
+            )
+            publish_discovery_configs(
+                config=mock_config,
+                publisher=Mock(),
+                entities=entities,
+                one_time_mode=True,
+            )
+
+        # Second cycle skips everything, so nothing new to write
+        assert mock_replace.call_count == 1
+        assert mock_fsync.call_count == 1
+        tmp_name = os.path.basename(mock_replace.call_args.args[0])
+        assert tmp_name.startswith(f"test_discovery_state.json.{os.getpid()}.")
+        assert os.listdir(self.temp_dir) == [os.path.basename(self.state_file)]
+        with open(self.state_file) as f:
+            state = json.load(f)
+        assert state["published_topics"] == [
+            f"homeassistant/sensor/t{i}/config" for i in range(5)
+        ]
+
+    def test_state_file_keeps_topic_list_order_and_extra_keys(self):
+        """In-memory set form round-trips to the original list layout."""
+        with open(self.state_file, "w") as f:
+            json.dump({"published_topics": ["b", "a"], "note": "kept"}, f)
+        mock_config = Mock()
+        mock_config.get.side_effect = lambda key, default=None: {
+            "home_assistant.enabled": True,
+            "home_assistant.discovery_state_file": self.state_file,
+        }.get(key, default)
+        entities = []
+        for topic in ["a", "c", "c"]:
+            entity = Mock()
+            entity.get_config_topic.return_value = topic
+            entity.get_config_payload.return_value = {}
+            entities.append(entity)
+
+        mock_publisher = Mock()
+        with patch(f"{_MODULE}.logger"):
+            publish_discovery_configs(
+                config=mock_config,
+                publisher=mock_publisher,
+                entities=entities,
+                one_time_mode=True,
+            )
+
+        assert mock_publisher.publish.call_count == 1
+        with open(self.state_file) as f:
+            state = json.load(f)
+        assert state["published_topics"] == ["b", "a", "c"]
+        assert state["note"] == "kept"
+
+    def test_unchanged_state_file_is_parsed_once_across_cycles(self):
+        """Parsed state is reused until the file's mtime/size change."""
+        with open(self.state_file, "w") as f:
+            json.dump({"published_topics": ["homeassistant/sensor/a/config"]}, f)
+        mock_config = Mock()
+        mock_config.get.side_effect = lambda key, default=None: {
+            "home_assistant.enabled": True,
+            "home_assistant.discovery_state_file": self.state_file,
+        }.get(key, default)
+        entity = Mock()
+        entity.get_config_topic.return_value = "homeassistant/sensor/a/config"
+        entity.get_config_payload.return_value = {}
+
+        def run():
+            mock_publisher = Mock()
+            publish_discovery_configs(
+                config=mock_config,
+                publisher=mock_publisher,
+                entities=[entity],
+                one_time_mode=True,
+            )
+            return mock_publisher.publish.call_count
+
+        with (
+            patch(f"{_MODULE}.logger"),
+            patch(f"{_MODULE}.json.load", wraps=json.load) as mock_load,
+        ):
+            assert [run(), run(), run()] == [0, 0, 0]
+            assert mock_load.call_count == 1
+
+            # An external rewrite is picked up on the next cycle
+            with open(self.state_file, "w") as f:
+                json.dump({"published_topics": []}, f)
+            os.utime(self.state_file, ns=(1, 1))
+            assert run() == 1
+            assert mock_load.call_count == 2
+
+    def test_topics_published_before_an_error_are_still_recorded(self):
+        """The batched state is flushed even when the publish loop raises."""
+        mock_config = Mock()
+        mock_config.get.side_effect = lambda key, default=None: {
+            "home_assistant.enabled": True,
+            "home_assistant.discovery_state_file": self.state_file,
+        }.get(key, default)
+        good = Mock()
+        good.get_config_topic.return_value = "homeassistant/sensor/good/config"
+        good.get_config_payload.return_value = {"name": "Good"}
+        bad = Mock()
+        bad.get_config_topic.return_value = "homeassistant/sensor/bad/config"
+        bad.get_config_payload.side_effect = RuntimeError("boom")
+
+        with patch(f"{_MODULE}.logger"), pytest.raises(RuntimeError):
+            publish_discovery_configs(
+                config=mock_config,
+                publisher=Mock(),
+                entities=[good, bad],
+                one_time_mode=True,
+            )
+
+        with open(self.state_file) as f:
+            state = json.load(f)
+        assert state["published_topics"] == ["homeassistant/sensor/good/config"]
+
     def test_normal_mode_always_publishes(self):
         """Test that normal mode (one_time_mode=False) always publishes."""
         # Create existing state file
@@ -206,13 +354,13 @@ class TestOneTimeDiscoveryMode:
         mock_config = Mock()
         mock_config.get.return_value = self.state_file
 
-        with patch("builtins.print") as mock_print:
+        with patch(f"{_MODULE}.logger") as mock_logger:
             clear_discovery_state(mock_config)
 
         # State file should be deleted
         assert not os.path.exists(self.state_file)
-        mock_print.assert_called_with(
-            f"Cleared discovery state file: {self.state_file}"
+        mock_logger.info.assert_called_with(
+            "Cleared discovery state file: %s", self.state_file
         )
 
     def test_clear_nonexistent_discovery_state(self):
@@ -221,11 +369,11 @@ class TestOneTimeDiscoveryMode:
         mock_config = Mock()
         mock_config.get.return_value = self.state_file
 
-        with patch("builtins.print") as mock_print:
+        with patch(f"{_MODULE}.logger") as mock_logger:
             clear_discovery_state(mock_config)
 
         # Should handle gracefully
-        mock_print.assert_called_with("Discovery state file does not exist")
+        mock_logger.info.assert_called_with("Discovery state file does not exist")
 
     def test_force_republish_discovery(self):
         """Test force republishing all discovery configs."""
@@ -253,7 +401,7 @@ class TestOneTimeDiscoveryMode:
         mock_entity.get_config_topic.return_value = "homeassistant/sensor/test/config"
         mock_entity.get_config_payload.return_value = {"name": "Test Sensor"}
 
-        with patch("builtins.print"):
+        with patch(f"{_MODULE}.logger"):
             force_republish_discovery(
                 config=mock_config, publisher=mock_publisher, entities=[mock_entity]
             )
@@ -313,7 +461,7 @@ class TestOneTimeDiscoveryMode:
         mock_entity.get_config_topic.return_value = "homeassistant/sensor/test/config"
         mock_entity.get_config_payload.return_value = {"name": "Test Sensor"}
 
-        with patch("builtins.print") as mock_print:
+        with patch(f"{_MODULE}.logger") as mock_logger:
             # Should handle permission error gracefully
             publish_discovery_configs(
                 config=mock_config,
@@ -325,11 +473,11 @@ class TestOneTimeDiscoveryMode:
         # Should still publish
         mock_publisher.publish.assert_called_once()
 
-        # Should print warning about state file write failure
+        # Should log warning about state file write failure
         warning_calls = [
             call
-            for call in mock_print.call_args_list
-            if "Warning: Could not save discovery state" in str(call)
+            for call in mock_logger.warning.call_args_list
+            if "Could not save discovery state" in call[0][0]
         ]
         assert len(warning_calls) > 0
 
@@ -350,7 +498,7 @@ class TestOneTimeDiscoveryMode:
         mock_entity.get_config_topic.return_value = "homeassistant/sensor/test/config"
         mock_entity.get_config_payload.return_value = {"name": "Test Sensor"}
 
-        with patch("builtins.print"):
+        with patch(f"{_MODULE}.logger"):
             publish_discovery_configs(
                 config=mock_config,
                 publisher=mock_publisher,
@@ -364,3 +512,28 @@ class TestOneTimeDiscoveryMode:
         # Clean up
         if os.path.exists(".ha_discovery_state.json"):
             os.remove(".ha_discovery_state.json")
+
+    def test_failed_state_write_removes_temp_file(self):
+        """A failed replace leaves neither a state file nor a stray temp."""
+        mock_config = Mock()
+        mock_config.get.side_effect = lambda key, default=None: {
+            "home_assistant.enabled": True,
+            "home_assistant.discovery_state_file": self.state_file,
+        }.get(key, default)
+        entity = Mock()
+        entity.get_config_topic.return_value = "homeassistant/sensor/t/config"
+        entity.get_config_payload.return_value = {}
+
+        with (
+            patch(f"{_MODULE}.logger") as mock_logger,
+            patch(f"{_MODULE}.os.replace", side_effect=OSError("disk full")),
+        ):
+            publish_discovery_configs(
+                config=mock_config,
+                publisher=Mock(),
+                entities=[entity],
+                one_time_mode=True,
+            )
+
+        mock_logger.warning.assert_called_once()
+        assert os.listdir(self.temp_dir) == []
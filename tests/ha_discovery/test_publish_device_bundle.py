@@ -53,3 +53,52 @@ def test_publish_device_bundle_builds_cmps_and_dev():
     assert bundle["cmps"]["t1"]["p"] == "sensor"
     assert bundle["qos"] == 1
     assert bundle["retain"] is True
+
+
+def test_component_payload_does_not_leak_into_entity_payload():
+    from ha_mqtt_publisher.ha_discovery.publisher import _entity_to_component_payload
+
+    cfg = StubConfig()
+    device = Device(cfg, identifiers=["dev01"], name="Demo")
+    sensor = Sensor(cfg, device, name="T", unique_id="t1", state_topic="x/t")
+
+    component = _entity_to_component_payload(sensor)
+
+    assert "device" not in component and component["p"] == "sensor"
+    payload = sensor.get_config_payload()
+    assert payload["device"]["identifiers"] == ["dev01"]
+    assert "p" not in payload
+
+
+def test_component_payload_skips_device_info_unless_payload_overridden():
+    from ha_mqtt_publisher.ha_discovery.publisher import _entity_to_component_payload
+
+    cfg = StubConfig()
+    calls = []
+
+    class CountingDevice(Device):
+        __slots__ = ()
+
+        def get_device_info(self):
+            calls.append(1)
+            return super().get_device_info()
+
+    device = CountingDevice(cfg, identifiers=["dev01"], name="Demo")
+
+    class CustomSensor(Sensor):
+        def get_config_payload(self):
+            payload = super().get_config_payload()
+            payload["custom"] = True
+            return payload
+
+    plain = Sensor(cfg, device, name="T", unique_id="t1", state_topic="x/t", foo=1)
+    custom = CustomSensor(cfg, device, name="H", unique_id="h1", state_topic="x/h")
+
+    component = _entity_to_component_payload(plain)
+    assert calls == []
+    expected = plain.get_config_payload()
+    del expected["device"]
+    assert component == {**expected, "p": "sensor"}
+
+    assert _entity_to_component_payload(custom)["custom"] is True
+    assert "device" not in _entity_to_component_payload(custom)
@@ -107,6 +107,24 @@ def test_extra_allowed_extends_sets_in_strict_mode():
     )
 
 
+def test_allowed_value_sets_mirror_literal_types():
+    """The allowed-value sets are frozen and derived from the Literal hints."""
+    from typing import get_args
+
+    from ha_mqtt_publisher.ha_discovery import constants
+
+    pairs = [
+        (constants.ENTITY_CATEGORIES, constants.EntityCategory),
+        (constants.AVAILABILITY_MODES, constants.AvailabilityMode),
+        (constants.SENSOR_STATE_CLASSES, constants.SensorStateClass),
+        (constants.SENSOR_DEVICE_CLASSES, constants.SensorDeviceClass),
+        (constants.BINARY_SENSOR_DEVICE_CLASSES, constants.BinarySensorDeviceClass),
+    ]
+    for allowed, literal in pairs:
+        assert isinstance(allowed, frozenset)
+        assert allowed == frozenset(get_args(literal))
+
+
 def test_binary_sensor_device_class_validation():
     """Invalid binary_sensor device_class should raise in strict mode."""
     config = MockConfig(
@@ -156,6 +174,20 @@ def test_object_id_slugification_preserves_unique_id():
     assert payload["object_id"] == "my_app_room_12"
 
 
+def test_device_slug_shares_object_id_rules_with_own_fallback():
+    from ha_mqtt_publisher.ha_discovery.entity import _slugify_object_id
+    from ha_mqtt_publisher.ha_discovery.publisher import _slugify
+
+    for raw in ["  My-Device  Name ", "a _!_ b", "Caf\u00e9 #1"]:
+        assert _slugify(raw) == _slugify_object_id(raw)
+    assert _slugify("a _!_ b") == "a_b"
+    assert _slugify("!!!") == "device"
+    assert _slugify_object_id("!!!") == "entity"
+    # ASCII fast path and regex path agree on separators and runs
+    assert _slugify_object_id("Living-Room\t--Temp__1") == "living_room_temp_1"
+    assert _slugify_object_id("Caf\u00e9 - \u00fcber_1") == "caf_ber_1"
+
+
 def test_public_exports_expected_and_not_exposing_internal():
     """Ensure key public classes are exported and internal ones are not."""
     mod = importlib.import_module("ha_mqtt_publisher.ha_discovery")
@@ -174,3 +206,57 @@ def test_public_exports_expected_and_not_exposing_internal():
     # Internal-only types should not be exported at top-level
     for internal_name in ["Vacuum", "Scene", "Siren"]:
         assert not hasattr(mod, internal_name), f"Should not export: {internal_name}"
+
+
+def test_exports_resolve_lazily_to_defining_modules():
+    import os
+    from pathlib import Path
+    import subprocess
+    import sys
+
+    code = (
+        "import sys, ha_mqtt_publisher.ha_discovery as hd\n"
+        "assert 'ha_mqtt_publisher.ha_discovery.entity' not in sys.modules\n"
+        "hd.DiscoveryManager\n"
+        "assert 'ha_mqtt_publisher.ha_discovery.publisher' not in sys.modules\n"
+        "missing = [n for n in hd.__all__ if getattr(hd, n, None) is None]\n"
+        "assert not missing, missing\n"
+        "assert set(hd.__all__) <= set(dir(hd))\n"
+        "from ha_mqtt_publisher.ha_discovery import publisher, status_sensor\n"
+        "assert hd.StatusSensor is status_sensor.StatusSensor\n"
+        "assert hd.StatusSensor is publisher.StatusSensor\n"
+        "assert not hasattr(hd, 'no_such_submodule')\n"
+    )
+    src = str(Path(__file__).parent.parent.parent / "src")
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": src},
+    )
+    assert result.returncode == 0, result.stderr
+
+
+def test_unimported_submodules_resolve_as_attributes():
+    import os
+    from pathlib import Path
+    import subprocess
+    import sys
+
+    code = (
+        "import sys, ha_mqtt_publisher.ha_discovery as hd\n"
+        "names = ['entity', 'device', 'publisher', 'discovery_manager',\n"
+        "         'enhanced_publisher']\n"
+        "assert 'ha_mqtt_publisher.ha_discovery.entity' not in sys.modules\n"
+        "for name in names:\n"
+        "    full = 'ha_mqtt_publisher.ha_discovery.' + name\n"
+        "    assert getattr(hd, name) is sys.modules[full], name\n"
+    )
+    src = str(Path(__file__).parent.parent.parent / "src")
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": src},
+    )
+    assert result.returncode == 0, result.stderr
@@ -15,3 +15,262 @@ def test_import_module():
         assert pkg is not None
     except ImportError as e:
         raise AssertionError("Should be able to import ha_mqtt_publisher module") from e
+
+
+def test_package_exports_resolve_lazily():
+    import os
+    import subprocess
+
+    code = (
+        "import sys, ha_mqtt_publisher as pkg\n"
+        "assert 'paho' not in sys.modules and 'yaml' not in sys.modules\n"
+        "assert 'ha_mqtt_publisher.mqtt_utils' not in sys.modules\n"
+        "assert pkg.mqtt_utils is sys.modules['ha_mqtt_publisher.mqtt_utils']\n"
+        "missing = [n for n in pkg.__all__ if getattr(pkg, n, None) is None]\n"
+        "assert not missing, missing\n"
+        "assert set(pkg.__all__) <= set(dir(pkg))\n"
+        "assert not hasattr(pkg, 'no_such_submodule')\n"
+    )
+    src = str(Path(__file__).parent.parent.parent / "src")
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": src},
+    )
+    assert result.returncode == 0, result.stderr
+
+
+def test_load_section_returns_only_requested_section(tmp_path):
+    from ha_mqtt_publisher.config import Config
+
+    path = tmp_path / "config.yaml"
+    path.write_text(
+        "app:\n"
+        "  name: Demo\n"
+        "mqtt:\n"
+        "  broker_url: mqtt.local\n"
+        "  broker_port: 1883\n"
+        "  auth: {username: u, password: p}\n"
+        "  topics: [a, b]\n"
+        "sensors:\n"
+        "  - name: one\n"
+        "  - name: two\n"
+    )
+
+    assert Config.load_section(path, "mqtt") == {
+        "broker_url": "mqtt.local",
+        "broker_port": 1883,
+        "auth": {"username": "u", "password": "p"},
+        "topics": ["a", "b"],
+    }
+    assert Config.load_section(path, "app") == {"name": "Demo"}
+    assert Config.load_section(path, "missing", {}) == {}
+
+
+def test_load_section_stops_before_later_sections(tmp_path):
+    from ha_mqtt_publisher.config import Config
+
+    path = tmp_path / "config.yaml"
+    # The trailing section is malformed; it must never be reached.
+    path.write_text("mqtt:\n  broker_url: mqtt.local\nbroken: [unclosed\n")
+
+    assert Config.load_section(path, "mqtt") == {"broker_url": "mqtt.local"}
+
+
+def test_load_section_resolves_external_anchor(tmp_path):
+    from ha_mqtt_publisher.config import Config
+
+    path = tmp_path / "config.yaml"
+    path.write_text("defaults: &d {qos: 1}\nmqtt:\n  opts: *d\n")
+
+    assert Config.load_section(path, "mqtt") == {"opts": {"qos": 1}}
+
+
+def test_load_section_non_mapping_document(tmp_path):
+    from ha_mqtt_publisher.config import Config
+
+    path = tmp_path / "config.yaml"
+    path.write_text("- a\n- b\n")
+
+    assert Config.load_section(path, "mqtt") is None
+
+
+def test_config_reuses_cached_parse_until_file_changes(tmp_path, monkeypatch):
+    import os
+
+    from ha_mqtt_publisher import config as config_module
+    from ha_mqtt_publisher.config import Config
+
+    Config.clear_cache()
+    path = tmp_path / "config.yaml"
+    path.write_text("mqtt:\n  broker_url: one\n")
+
+    calls = []
+    real_load = config_module.yaml.load
+
+    def counting_load(stream, Loader):
+        calls.append(Loader)
+        return real_load(stream, Loader=Loader)
+
+    monkeypatch.setattr(config_module.yaml, "load", counting_load)
+
+    first = Config(path)
+    second = Config(path)
+    assert len(calls) == 1
+    assert calls[0] is getattr(config_module.yaml, "CSafeLoader", calls[0])
+    assert second.get("mqtt.broker_url") == "one"
+
+    # Instances must not share mutable state with each other or the cache
+    first.config["mqtt"]["broker_url"] = "mutated"
+    assert Config(path).get("mqtt.broker_url") == "one"
+
+    path.write_text("mqtt:\n  broker_url: two-changed\n")
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert Config(path).get("mqtt.broker_url") == "two-changed"
+    assert len(calls) == 2
+
+    Config.clear_cache()
+    Config(path)
+    assert len(calls) == 3
+
+
+def test_json_shadow_used_when_enabled_and_fresh(tmp_path, monkeypatch):
+    import os
+
+    from ha_mqtt_publisher import config as config_module
+    from ha_mqtt_publisher.config import Config
+
+    Config.clear_cache()
+    path = tmp_path / "config.yaml"
+    path.write_text("mqtt:\n  broker_url: one\n")
+    shadow = tmp_path / "config.yaml.cache.json"
+
+    # Disabled by default: no shadow written
+    monkeypatch.delenv("HA_MQTT_YAML_JSON_CACHE", raising=False)
+    Config(path)
+    assert not shadow.exists()
+
+    monkeypatch.setenv("HA_MQTT_YAML_JSON_CACHE", "1")
+    Config.clear_cache()
+    assert Config(path).get("mqtt.broker_url") == "one"
+    assert shadow.exists()
+
+    # A fresh shadow is read without touching YAML
+    def fail_load(*args, **kwargs):
+        raise AssertionError("YAML should not be parsed")
+
+    Config.clear_cache()
+    monkeypatch.setattr(config_module.yaml, "load", fail_load)
+    assert Config(path).get("mqtt.broker_url") == "one"
+    monkeypatch.undo()
+    monkeypatch.setenv("HA_MQTT_YAML_JSON_CACHE", "1")
+
+    # A newer YAML file invalidates the shadow
+    path.write_text("mqtt:\n  broker_url: two\n")
+    st = os.stat(shadow)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    Config.clear_cache()
+    assert Config(path).get("mqtt.broker_url") == "two"
+
+
+def test_json_shadow_skipped_when_lossy(tmp_path, monkeypatch):
+    from ha_mqtt_publisher.config import Config
+
+    monkeypatch.setenv("HA_MQTT_YAML_JSON_CACHE", "1")
+    Config.clear_cache()
+    path = tmp_path / "config.yaml"
+    path.write_text("app:\n  released: 2024-01-02\n  ports: {1: a}\n")
+
+    Config(path)
+    assert not (tmp_path / "config.yaml.cache.json").exists()
+
+
+def test_config_flat_index_lookups(tmp_path):
+    import copy
+
+    import pytest
+
+    from ha_mqtt_publisher.config import Config
+
+    path = tmp_path / "config.yaml"
+    path.write_text(
+        "mqtt_broker_url: top\n"
+        "mqtt:\n  broker_url: nested\n  auth:\n    username: user\n"
+        "app:\n  name: demo\n"
+    )
+    cfg = Config(path)
+
+    # Top-level keys win over nested paths that join to the same name
+    assert cfg.mqtt_broker_url == "top"
+    assert cfg.get("mqtt.broker_url") == "nested"
+    assert cfg.mqtt_auth_username == "user"
+    assert cfg.get("mqtt.auth.username") == "user"
+    assert cfg.get("app_name") == "demo"
+    assert cfg.get("app") == {"name": "demo"}
+    assert cfg.get("app.missing", "dflt") == "dflt"
+    with pytest.raises(AttributeError):
+        _ = cfg.app_missing
+
+    cfg.config["app"]["name"] = "edited"
+    cfg.refresh_index()
+    assert cfg.get("app.name") == "edited"
+
+    cfg.config = {"other": {"key": 1}}
+    assert cfg.other_key == 1
+    assert cfg.get("mqtt.broker_url") is None
+    assert copy.copy(cfg).get("other.key") == 1
+
+
+def test_config_copies_are_independent_for_all_node_types(tmp_path):
+    import datetime
+
+    from ha_mqtt_publisher.config import Config
+
+    Config.clear_cache()
+    path = tmp_path / "config.yaml"
+    path.write_text(
+        "base: &base {port: 1883, tags: [a, b]}\n"
+        "copy: *base\n"
+        "since: 2024-01-02\n"
+        "loop: &loop [1, *loop]\n"
+        "node: &node {self: *node}\n"
+    )
+
+    first = Config(path)
+    second = Config(path)
+    assert second.config["since"] == datetime.date(2024, 1, 2)
+    assert second.get("copy.tags") == ["a", "b"]
+
+    first.config["base"]["tags"].append("c")
+    assert second.get("base.tags") == ["a", "b"]
+    assert Config(path).get("copy.tags") == ["a", "b"]
+
+    loop = Config(path).config["loop"]
+    assert loop[1] is loop
+    assert loop is not first.config["loop"]
+    assert second.get("node.self.self") is second.config["node"]
+    assert second.node_self is second.config["node"]
+
+
+def test_config_lookups_follow_in_place_edits(tmp_path):
+    from ha_mqtt_publisher.config import Config
+
+    path = tmp_path / "config.yaml"
+    path.write_text('mqtt:\n  broker_url: host\n"a.b": top\n')
+    cfg = Config(path)
+
+    cfg.config["mqtt"]["broker_url"] = "changed"
+    cfg.config["mqtt"]["new"] = "added"
+    assert cfg.get("mqtt.broker_url") == "changed"
+    assert cfg.mqtt_broker_url == "changed"
+    assert cfg.get("mqtt.new") == "added"
+    assert cfg.mqtt_new == "added"
+
+    # Dotted names are paths, never literal top-level keys
+    assert cfg.get("a.b") is None
+
+    del cfg.config["mqtt"]["broker_url"]
+    assert cfg.get("mqtt.broker_url", "gone") == "gone"
+    assert cfg.get("mqtt_broker_url", "gone") == "gone"
@@ -419,6 +419,25 @@ class TestPublisherAdditionalCoverage:
         # Should return False on failure
         assert result is False
 
+    def test_publish_passes_pre_encoded_payloads_through(self):
+        """Test that str/bytes payloads are not re-encoded, dicts are."""
+        publisher = MQTTPublisher(broker_url="test.broker.com", client_id="test")
+        publisher._connected = True
+
+        mock_client = Mock()
+        mock_client.publish.return_value.rc = 0
+        publisher.client = mock_client
+
+        encoded = b'{"a": 1}'
+        assert publisher.publish("t", encoded) is True
+        assert mock_client.publish.call_args[0][1] is encoded
+
+        assert publisher.publish("t", bytearray(b"raw")) is True
+        assert mock_client.publish.call_args[0][1] == bytearray(b"raw")
+
+        assert publisher.publish("t", {"a": 1}) is True
+        assert mock_client.publish.call_args[0][1] == '{"a": 1}'
+
     def test_get_connection_error_message_known_codes(self):
         """Test error message generation for known error codes."""
         config = {
@@ -488,3 +507,20 @@ class TestPublisherAdditionalCoverage:
                 assert "Failed to connect" in str(e)
 
             mock_connect.assert_called_once()
+
+    def test_subscribe_many_and_unsubscribe_many_send_one_packet(self):
+        """Topic lists are sent as a single (un)subscribe call."""
+        publisher = MQTTPublisher(broker_url="test.broker.com", client_id="c")
+        publisher.client = Mock()
+        publisher.client.subscribe.return_value = (0, 1)
+        publisher.client.unsubscribe.return_value = (0, 2)
+        publisher._connected = True
+        callback = Mock()
+
+        assert publisher.subscribe_many(["a/b", "c/d"], qos=1, callback=callback)
+        assert publisher.unsubscribe_many(["a/b", "c/d"])
+
+        publisher.client.subscribe.assert_called_once_with([("a/b", 1), ("c/d", 1)])
+        publisher.client.unsubscribe.assert_called_once_with(["a/b", "c/d"])
+        assert publisher.client.message_callback_add.call_count == 2
+        assert publisher.client.message_callback_remove.call_count == 2
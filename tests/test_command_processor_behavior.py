@@ -76,3 +76,189 @@ def test_cooldown_blocks_second_success_until_elapsed():
     assert "cooldown" in outcomes
     # Ensure at least two successes separated by cooldown
     assert outcomes.count("success") >= 2
+
+
+def test_duplicate_ids_ignored_within_bounded_history():
+    pub = PubSpy()
+    cp = CommandProcessor(pub, "ack", "result", qos=0, max_history=2)
+
+    for cmd_id in ("a", "b", "a"):
+        cp.handle_raw(json.dumps({"command": "nope", "id": cmd_id}))
+    acks = [json.loads(p)["id"] for t, p, _q, _r in pub.pubs if t == "ack"]
+    assert acks == ["a", "b"]
+
+    # "c" evicts "a" from the window, so "a" is accepted again
+    for cmd_id in ("c", "a"):
+        cp.handle_raw(json.dumps({"command": "nope", "id": cmd_id}))
+    acks = [json.loads(p)["id"] for t, p, _q, _r in pub.pubs if t == "ack"]
+    assert acks == ["a", "b", "c", "a"]
+    assert cp._recent_set == set(cp._recent_ids) == {"c", "a"}
+
+
+def test_executor_runs_on_reused_pool_thread_and_close():
+    import threading
+
+    pub = PubSpy()
+    cp = CommandProcessor(pub, "ack", "result", qos=0)
+    threads = []
+    done = threading.Event()
+
+    def record(ctx):
+        threads.append(threading.current_thread().name)
+        assert threading.current_thread().daemon
+        done.set()
+        return "success", "ok", {}
+
+    cp.register("rec", record)
+    for _ in range(2):
+        done.clear()
+        cp.handle_raw("rec")
+        assert done.wait(1.0)
+        time.sleep(0.05)
+
+    assert len(threads) == 2
+    assert threads[0] == threads[1]
+    assert threads[0].startswith("cmd")
+
+    cp.close()
+    pub.pubs.clear()
+    cp.handle_raw("rec")
+    assert len(threads) == 2
+    assert not cp._cmd_locks["rec"].locked()
+    result = _parse("result", pub.pubs)
+    assert result["outcome"] == "closed"
+    assert result["id"] == _parse("ack", pub.pubs)["id"]
+
+
+def test_hung_executor_does_not_block_interpreter_exit():
+    import os
+    from pathlib import Path
+    import subprocess
+    import sys
+
+    code = (
+        "import threading, time\n"
+        "from ha_mqtt_publisher.commands import CommandProcessor\n"
+        "class Pub:\n"
+        "    def publish(self, *a, **k): pass\n"
+        "started = threading.Event()\n"
+        "def hang(ctx):\n"
+        "    started.set()\n"
+        "    threading.Event().wait()\n"
+        "cp = CommandProcessor(Pub(), 'ack', 'result')\n"
+        "cp.register('hang', hang)\n"
+        "cp.handle_raw('hang')\n"
+        "assert started.wait(5)\n"
+        "cp.close()\n"
+    )
+    src = str(Path(__file__).parent.parent / "src")
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        timeout=30,
+        env={**os.environ, "PYTHONPATH": src},
+    )
+    assert result.returncode == 0, result.stderr
+
+
+def test_result_payload_encodes_non_string_keys_and_unicode():
+    pub = PubSpy()
+    cp = CommandProcessor(pub, "ack", "result", qos=0)
+
+    def ok(ctx):
+        return "success", "café", {"counts": {1: "x"}}
+
+    cp.register("uni", ok)
+    cp.handle_raw('{"command": "uni", "id": "u1"}')
+    time.sleep(0.2)
+
+    result = _parse("result", pub.pubs)
+    assert result["details"] == "café"
+    assert result["counts"] == {"1": "x"}
+
+
+def test_handle_raw_accepts_json_and_plain_bytes():
+    pub = PubSpy()
+    cp = CommandProcessor(pub, "ack", "result", qos=0)
+
+    cp.handle_raw(b'  {"command": "Alpha", "id": "b1"}\n')
+    cp.handle_raw(bytearray(b" beta "))
+    cp.handle_raw(b"{not json")
+
+    acks = [json.loads(p) for t, p, _q, _r in pub.pubs if t == "ack"]
+    assert (acks[0]["id"], acks[0]["command"]) == ("b1", "alpha")
+    assert [a["command"] for a in acks[1:]] == ["beta", "{not json"]
+
+
+def test_register_canonicalizes_command_name():
+    pub = PubSpy()
+    cp = CommandProcessor(pub, "ack", "result", qos=0)
+
+    cp.register(" Refresh ", lambda ctx: ("success", "ok", {}))
+    assert list(cp.executors) == ["refresh"]
+    assert cp.build_registry_payload()["commands"][0]["name"] == "refresh"
+
+    cp.handle_raw("REFRESH")
+    time.sleep(0.2)
+    assert _parse("result", pub.pubs)["outcome"] == "success"
+
+
+def test_different_commands_run_concurrently_same_command_is_busy():
+    import threading
+
+    pub = PubSpy()
+    cp = CommandProcessor(pub, "ack", "result", qos=0)
+    release = threading.Event()
+    started = []
+
+    def slow(ctx):
+        started.append(ctx["command"])
+        release.wait(1.0)
+        return "success", "ok", {}
+
+    cp.register("scan", slow)
+    cp.register("publish_event", slow)
+
+    cp.handle_raw("scan")
+    cp.handle_raw("publish_event")
+    cp.handle_raw("scan")
+    time.sleep(0.1)
+    assert sorted(started) == ["publish_event", "scan"]
+
+    release.set()
+    time.sleep(0.2)
+    results = [json.loads(p) for t, p, _q, _r in pub.pubs if t == "result"]
+    outcomes = sorted((r["command"], r["outcome"]) for r in results)
+    assert outcomes == [
+        ("publish_event", "success"),
+        ("scan", "busy"),
+        ("scan", "success"),
+    ]
+
+
+def test_auto_registry_publish_skips_unchanged_registry():
+    pub = PubSpy()
+    cp = CommandProcessor(pub, "ack", "result", qos=0)
+    cp.enable_auto_registry_publish("registry")
+
+    def ok(ctx):
+        return "success", "ok", {}
+
+    cp.register("ping", ok, description="Ping")
+    cp.register("ping", ok, description="Ping")
+    assert len([t for t, *_ in pub.pubs if t == "registry"]) == 1
+
+    cp.register("ping", ok, description="Ping again")
+    assert len([t for t, *_ in pub.pubs if t == "registry"]) == 2
+
+    # Explicit publishes are unconditional unless asked otherwise
+    cp.publish_registry("registry")
+    cp.publish_registry("registry", only_if_changed=True)
+    assert len([t for t, *_ in pub.pubs if t == "registry"]) == 3
+
+
+def test_command_processor_uses_slots():
+    cp = CommandProcessor(PubSpy(), "ack", "result", qos=0)
+    assert not hasattr(cp, "__dict__")
+    cp.close()
@@ -1,8 +1,10 @@
 """Tests for MQTTConfig utility class."""
 
+import dataclasses
+
 import pytest
 
-from ha_mqtt_publisher.config import MQTTConfig
+from ha_mqtt_publisher.config import MQTTConfig, MQTTSettings
 
 
 class TestMQTTConfigBuildConfig:
@@ -71,6 +73,20 @@ class TestMQTTConfigBuildConfig:
 
         assert config["last_will"] == lwt_config
 
+    def test_none_defaults_but_empty_strings_kept(self):
+        """Test that only None falls back to the client_id/security defaults."""
+        config = MQTTConfig.build_config(
+            broker_url="test.broker.com", client_id=None, security=None
+        )
+        assert config["client_id"] == "mqtt_client"
+        assert config["security"] == "none"
+
+        config = MQTTConfig.build_config(
+            broker_url="test.broker.com", client_id="", security=""
+        )
+        assert config["client_id"] == ""
+        assert config["security"] == ""
+
     def test_missing_broker_url(self):
         """Test error when broker_url is missing."""
         with pytest.raises(ValueError, match="broker_url is required"):
@@ -145,6 +161,16 @@ class TestMQTTConfigFromDict:
         with pytest.raises(ValueError, match="broker_url is required"):
             MQTTConfig.from_dict(config_dict)
 
+    def test_unset_scalars_fall_back_to_defaults(self):
+        """Test that keys missing from the section get build_config defaults."""
+        config = MQTTConfig.from_dict({"mqtt": {"broker_url": "mqtt.example.com"}})
+
+        assert config["default_qos"] == 0
+        assert config["default_retain"] is False
+        assert config["max_retries"] == 3
+        assert "tls" not in config
+        assert "auth" not in config
+
     def test_tls_and_last_will_from_dict(self):
         """Test TLS and Last Will configuration from dict."""
         config_dict = {
@@ -170,6 +196,46 @@ class TestMQTTConfigFromDict:
         assert config["last_will"]["payload"] == "offline"
 
 
+class TestMQTTConfigFromMapping:
+    """Test MQTTConfig.from_mapping() key resolution."""
+
+    def test_dotted_keys_override_nested_section(self):
+        """Test 'mqtt.<key>' entries win over the nested section."""
+        mapping = {
+            "mqtt.broker_port": 8883,
+            "mqtt": {"broker_url": "nested.example.com", "broker_port": 1883},
+            "broker_url": "ignored.example.com",
+        }
+
+        config = MQTTConfig.from_mapping(mapping)
+
+        assert config["broker_url"] == "nested.example.com"
+        assert config["broker_port"] == 8883
+
+    def test_flat_keys_used_without_section(self):
+        """Test bare keys are read when there is no nested section."""
+        mapping = {
+            "broker_url": "flat.example.com",
+            "username": "user",
+            "password": "pass",
+        }
+
+        config = MQTTConfig.from_mapping(mapping)
+
+        assert config["broker_url"] == "flat.example.com"
+        assert config["auth"] == {"username": "user", "password": "pass"}
+
+    def test_custom_section(self):
+        """Test a custom section name for both dotted and nested keys."""
+        mapping = {"broker.auth": {"username": "u", "password": "p"}}
+        mapping["broker"] = {"broker_url": "custom.example.com"}
+
+        config = MQTTConfig.from_mapping(mapping, section="broker")
+
+        assert config["broker_url"] == "custom.example.com"
+        assert config["auth"] == {"username": "u", "password": "p"}
+
+
 class TestMQTTConfigValidateConfig:
     """Test MQTTConfig.validate_config() functionality."""
 
@@ -301,3 +367,59 @@ class TestMQTTConfigValidateConfig:
         assert "broker_port must be integer 1-65535" in error_message
         assert "client_id is required" in error_message
         assert "username and password required" in error_message
+
+    def test_error_message_layout(self):
+        """Test that errors are reported in check order, one bullet per line."""
+        config = {"broker_port": 8883, "security": "tls"}
+
+        with pytest.raises(ValueError) as exc_info:
+            MQTTConfig.validate_config(config)
+
+        assert str(exc_info.value) == (
+            "MQTT configuration errors:\n"
+            "- broker_url is required\n"
+            "- client_id is required\n"
+            "- username and password required when security='tls'\n"
+            "- TLS configuration required when security='tls'\n"
+            "- Warning: TLS disabled but using TLS port 8883. "
+            "Consider port 1883 for non-TLS"
+        )
+
+
+class TestMQTTSettings:
+    """Test the immutable MQTTSettings form of a built config."""
+
+    def test_build_settings_round_trips_to_dict(self):
+        """Test that settings carry the same values as build_config()."""
+        kwargs = {
+            "broker_url": "mqtt.example.com",
+            "broker_port": "8883",
+            "username": "user",
+            "password": "pass",
+            "tls": {"verify": True},
+        }
+        settings = MQTTConfig.build_settings(**kwargs)
+
+        assert isinstance(settings, MQTTSettings)
+        assert settings.broker_port == 8883
+        assert settings.as_dict() == MQTTConfig.build_config(**kwargs)
+        assert MQTTSettings(**MQTTConfig.build_config(**kwargs)) == settings
+        assert MQTTConfig.to_publisher_kwargs(settings) == (
+            MQTTConfig.to_publisher_kwargs(settings.as_dict())
+        )
+        settings.validate()
+
+    def test_settings_are_frozen_and_slotted(self):
+        """Test that settings cannot be changed or given new attributes."""
+        settings = MQTTConfig.build_settings(broker_url="test.broker.com")
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            settings.broker_port = 1
+        assert not hasattr(settings, "__dict__")
+
+    def test_validate_reports_errors(self):
+        """Test that validate() applies validate_config() rules."""
+        settings = MQTTSettings(broker_url="mqtt.example.com", security="username")
+
+        with pytest.raises(ValueError, match="username and password required"):
+            settings.validate()
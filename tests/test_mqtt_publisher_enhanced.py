@@ -125,6 +125,18 @@ class TestMQTTPublisherConfigDict:
         assert publisher.auth["username"] == "user"
         assert publisher.auth["password"] == "pass"
 
+    def test_mqtt_settings_accepted_as_config(self):
+        """Test that MQTTPublisher accepts an MQTTSettings instance."""
+        settings = MQTTConfig.build_settings(
+            broker_url="mqtt.example.com", client_id="settings_client"
+        )
+
+        publisher = MQTTPublisher(config=settings)
+
+        assert publisher.broker_url == "mqtt.example.com"
+        assert publisher.client_id == "settings_client"
+        assert publisher.default_retain is False
+
 
 class TestMQTTPublisherValidation:
     """Test MQTTPublisher configuration validation."""
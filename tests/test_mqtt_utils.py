@@ -27,6 +27,12 @@ def test_extract_properties_from_kwargs():
     assert mqtt_utils.extract_properties(properties=props) is props
 
 
+def test_extract_properties_prefers_kwargs_over_positional():
+    props = DummyProps()
+    assert mqtt_utils.extract_properties(DummyProps(), properties=props) is props
+    assert mqtt_utils.extract_properties(0, props, properties=None) is props
+
+
 def test_extract_properties_from_positional():
     props = DummyProps()
     # case where last arg is not int-like
@@ -110,3 +116,45 @@ def test_extract_reason_code_with_paho_like_reason_code():
 
     rc = FakeReasonCode(0)
     assert mqtt_utils.extract_reason_code("flags", rc, "props") is rc
+
+
+def test_safe_wrappers_forward_v2_callbacks_directly():
+    class Version:
+        name = "VERSION2"
+
+    calls = []
+
+    def record(*args):
+        calls.append(args)
+
+    props = DummyProps()
+    mqtt_utils.safe_on_connect(record, api_version=Version())("c", "u", {}, 0, props)
+    mqtt_utils.safe_on_disconnect(record, api_version=Version())(
+        "c", "u", "flags", 7, props
+    )
+    mqtt_utils.safe_on_publish(record, api_version=Version())("c", "u", 3, 0, props)
+
+    assert calls == [
+        ("c", "u", 0, props),
+        ("c", "u", 7, props),
+        ("c", "u", 3, 0, props),
+    ]
+
+
+def test_safe_on_publish_two_args_picks_reason_code_or_properties():
+    from paho.mqtt.packettypes import PacketTypes
+    from paho.mqtt.reasoncodes import ReasonCode
+
+    calls = []
+
+    @mqtt_utils.safe_on_publish
+    def on_publish(client, userdata, mid, reason_codes, properties):
+        calls.append((mid, reason_codes, properties))
+
+    rc = ReasonCode(PacketTypes.PUBACK, "Success")
+    props = DummyProps()
+    on_publish("c", "u", 1, 0)
+    on_publish("c", "u", 2, rc)
+    on_publish("c", "u", 3, props)
+
+    assert calls == [(1, 0, None), (2, rc, None), (3, None, props)]
@@ -33,11 +33,11 @@ def test_run_service_once_marks_availability_online_offline():
     assert called == {"setup": 1, "cycle": 1, "teardown": 1}
     # Expect two availability publishes
     assert (
-        client.calls[0][0].endswith("/availability") and client.calls[0][1] == "online"
+        client.calls[0][0].endswith("/availability") and client.calls[0][1] == b"online"
     )
     assert (
         client.calls[-1][0].endswith("/availability")
-        and client.calls[-1][1] == "offline"
+        and client.calls[-1][1] == b"offline"
     )
 
 
@@ -62,5 +62,67 @@ def test_run_service_loop_stops_with_event_and_publishes_availability():
     )
 
     assert ticks["count"] >= 1
-    assert client.calls[0][1] == "online"
-    assert client.calls[-1][1] == "offline"
+    assert client.calls[0][1] == b"online"
+    assert client.calls[-1][1] == b"offline"
+
+
+def test_run_service_loop_ignores_wall_clock_jumps(monkeypatch):
+    from ha_mqtt_publisher import service_runner
+
+    # A wall clock that jumps back an hour on every read
+    wall = iter(range(0, -(10**6), -3600))
+    monkeypatch.setattr(service_runner.time, "time", lambda: next(wall))
+
+    stop = threading.Event()
+    ticks = {"count": 0}
+
+    def on_tick():
+        ticks["count"] += 1
+        if ticks["count"] == 2:
+            stop.set()
+
+    guard = threading.Timer(2.0, stop.set)
+    guard.start()
+    try:
+        run_service_loop(
+            interval_s=0.01, on_tick=on_tick, stop_event=stop, install_signals=False
+        )
+    finally:
+        guard.cancel()
+
+    assert ticks["count"] == 2
+
+
+def test_run_service_loop_runs_in_worker_thread_with_signals_enabled():
+    stop = threading.Event()
+    errors = []
+
+    def target():
+        try:
+            run_service_loop(interval_s=0.01, on_tick=stop.set, stop_event=stop)
+        except Exception as exc:  # pragma: no cover - failure path
+            errors.append(exc)
+
+    worker = threading.Thread(target=target)
+    worker.start()
+    worker.join(2)
+
+    assert not worker.is_alive()
+    assert errors == []
+
+
+def test_install_signal_handlers_installs_and_restores():
+    import signal
+
+    from ha_mqtt_publisher import install_signal_handlers
+
+    before_int = signal.getsignal(signal.SIGINT)
+    before_term = signal.getsignal(signal.SIGTERM)
+
+    with install_signal_handlers(lambda: None) as ctl:
+        assert signal.getsignal(signal.SIGINT) is not before_int
+        assert signal.getsignal(signal.SIGTERM) is not before_term
+        assert not hasattr(ctl, "__dict__")
+
+    assert signal.getsignal(signal.SIGINT) is before_int
+    assert signal.getsignal(signal.SIGTERM) is before_term
@@ -1,3 +1,9 @@
+from dataclasses import asdict, fields
+import json
+import threading
+import time
+
+from ha_mqtt_publisher.json_publish import publish_json, publish_many
 from ha_mqtt_publisher.status import StatusPayload
 from ha_mqtt_publisher.topic_map import TopicMap
 from ha_mqtt_publisher.validator import validate_retained
@@ -34,8 +40,34 @@ def test_status_payload_marks_run_and_caps_errors():
 
     for i in range(25):
         s.add_error("x", f"e{i}")
+    errors = s.errors
     s.cap_errors(10)
     assert len(s.errors) == 10
+    assert s.errors is errors
+    assert [e.message for e in s.errors] == [f"e{i}" for i in range(15, 25)]
+    s.cap_errors(0)
+    assert s.errors == []
+
+
+def test_status_payload_as_dict_matches_dataclass_fields():
+    s = StatusPayload(status="error", event_count=3)
+    s.mark_run()
+    s.add_error("publish", "boom", when_iso="2024-01-01T00:00:00", topic="a/b")
+    s.add_error("ai", "nope")
+
+    d = s.as_dict()
+
+    assert d == asdict(s)
+    assert list(d) == [f.name for f in fields(StatusPayload)]
+    d["errors"][0]["extra"]["topic"] = "changed"
+    assert s.errors[0].extra == {"topic": "a/b"}
+
+
+def test_status_and_topic_objects_have_no_instance_dict():
+    s = StatusPayload(status="ok")
+    s.add_error("x", "e")
+    for obj in (s, s.errors[0], TopicMap(base="demo")):
+        assert not hasattr(obj, "__dict__")
 
 
 def test_topic_map_shapes_paths():
@@ -44,6 +76,9 @@ def test_topic_map_shapes_paths():
     assert tm.availability == "demo/availability"
     assert tm.commands == "demo/cmd"
     assert tm.cmd("refresh") == "demo/cmd/refresh"
+    assert tm.events == "demo/events"
+    assert tm == TopicMap(base="demo")
+    assert repr(tm) == "TopicMap(base='demo')"
 
 
 def test_validate_retained_collects_payloads():
@@ -53,3 +88,84 @@ def test_validate_retained_collects_payloads():
     )  # only the first will get payload in our spy
     # one of the two topics should be present with the simulated payload
     assert any(v == b'{"hello":true}' for v in out.values())
+
+
+def test_validate_retained_returns_once_all_topics_arrive():
+    class LateClient:
+        def subscribe(self, topic, qos=0, callback=None):
+            class Msg:
+                payload = b"1"
+
+            Msg.topic = topic
+            threading.Timer(0.01, callback, (None, None, Msg())).start()
+            return True
+
+    started = time.monotonic()
+    out = validate_retained(LateClient(), ["a/b", "x/y"], timeout_s=5)
+
+    assert out == {"a/b": b"1", "x/y": b"1"}
+    assert time.monotonic() - started < 1
+
+
+def test_validate_retained_returns_immediately_without_topics():
+    started = time.monotonic()
+    assert validate_retained(SpyClient(), [], timeout_s=5) == {}
+    assert time.monotonic() - started < 1
+
+
+def test_validate_retained_batches_subscriptions_when_supported():
+    calls = []
+
+    class BatchClient:
+        def subscribe_many(self, topics, qos=0, callback=None):
+            calls.append(("sub", list(topics)))
+
+            class Msg:
+                payload = b"1"
+
+            for t in topics:
+                Msg.topic = t
+                callback(None, None, Msg())
+            return True
+
+        def unsubscribe_many(self, topics):
+            calls.append(("unsub", list(topics)))
+            return True
+
+    out = validate_retained(BatchClient(), ["a/b", "x/y"], timeout_s=5)
+
+    assert out == {"a/b": b"1", "x/y": b"1"}
+    assert calls == [("sub", ["a/b", "x/y"]), ("unsub", ["a/b", "x/y"])]
+
+
+def test_publish_json_sends_compact_bytes_without_mutating_input():
+    sent = []
+
+    class PubClient:
+        def publish(self, topic, payload, qos=0, retain=False):
+            sent.append((topic, payload, qos, retain))
+
+    obj = {"a": 1, 2: "b"}
+    publish_json(PubClient(), "t", obj, qos=1, ensure_ts_field="ts", ts_value="now")
+
+    topic, payload, qos, retain = sent[0]
+    assert (topic, qos, retain) == ("t", 1, True)
+    assert isinstance(payload, bytes) and b" " not in payload
+    assert json.loads(payload) == {"a": 1, "2": "b", "ts": "now"}
+    assert obj == {"a": 1, 2: "b"}
+
+
+def test_publish_many_stamps_whole_batch_with_one_timestamp():
+    sent = []
+
+    class PubClient:
+        def publish(self, topic, payload, qos=0, retain=False):
+            sent.append(json.loads(payload))
+
+    messages = [(f"t{i}", {"i": i}, 0, True) for i in range(3)]
+    publish_many(PubClient(), messages, ensure_ts_field="ts")
+    publish_many(PubClient(), [("t", {"ts": "kept"}, 0, True)], ensure_ts_field="ts")
+
+    assert [m["i"] for m in sent[:3]] == [0, 1, 2]
+    assert len({m["ts"] for m in sent[:3]}) == 1
+    assert sent[3] == {"ts": "kept"}